@@ -1,13 +1,15 @@
 import os
 import sys
+import atexit
 import argparse
+import threading
 from typing import List, Dict, Any
 
 from langchain_community.vectorstores import Chroma
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationSummaryBufferMemory
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_openai import ChatOpenAI
 from langchain_openai import OpenAIEmbeddings
@@ -66,7 +68,7 @@ class CorporateChatbot:
         self.documents = []
         self.vectorstore = None
         self.conversation_chain = None
-        self.chat_history = []
+        self._persist_thread = None
         
         self.llm = ChatOpenAI(
             openai_api_key=OPENAI_API_KEY,
@@ -113,9 +115,10 @@ class CorporateChatbot:
         
         print(f"Documento carregado com {len(documents)} páginas")
         
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=500,
-            chunk_overlap=100,
+        text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+            encoding_name="cl100k_base",
+            chunk_size=256,
+            chunk_overlap=32,
             separators=["\n\n", "\n", ".", " ", ""]
         )
         self.documents = text_splitter.split_documents(documents)
@@ -150,15 +153,32 @@ class CorporateChatbot:
         )
         
         if persist_directory:
-            try:
-                self.vectorstore.persist()
-                print(f"Índice vetorial criado e persistido em {persist_directory}")
-            except Exception as e:
-                print(f"Aviso: Não foi possível persistir o índice: {e}")
-                print(f"O índice será usado apenas em memória para esta sessão.")
+            # A gravação em disco roda em segundo plano para não atrasar as primeiras perguntas
+            self._persist_thread = threading.Thread(
+                target=self._persist_index,
+                args=(persist_directory,),
+                daemon=False
+            )
+            self._persist_thread.start()
+            atexit.register(self._persist_thread.join)
+            print(f"Índice vetorial criado; persistindo em {persist_directory} em segundo plano")
         else:
             print("Índice vetorial criado em memória")
 
+    def _persist_index(self, persist_directory: str) -> None:
+        """
+        Persiste o índice vetorial em disco (executado em uma thread separada).
+        
+        Args:
+            persist_directory (str): Diretório onde o índice é persistido
+        """
+        try:
+            self.vectorstore.persist()
+            print(f"Índice vetorial persistido em {persist_directory}")
+        except Exception as e:
+            print(f"Aviso: Não foi possível persistir o índice: {e}")
+            print(f"O índice será usado apenas em memória para esta sessão.")
+
     def setup_conversation_chain(self) -> None:
         """
         Configura a cadeia de conversação para o chatbot.
@@ -168,9 +188,16 @@ class CorporateChatbot:
         
         print("Configurando cadeia de conversação...")
         
-        memory = ConversationBufferMemory(
+        # Turnos antigos são resumidos para manter o prompt com tamanho limitado
+        memory = ConversationSummaryBufferMemory(
+            llm=ChatOpenAI(
+                openai_api_key=OPENAI_API_KEY,
+                model_name="gpt-4o-mini",
+                temperature=0
+            ),
             memory_key="chat_history",
-            return_messages=True
+            return_messages=True,
+            max_token_limit=1000
         )
         
         qa_prompt = PromptTemplate(
@@ -181,7 +208,7 @@ class CorporateChatbot:
         self.conversation_chain = ConversationalRetrievalChain.from_llm(
             llm=self.llm,
             retriever=self.vectorstore.as_retriever(
-                search_kwargs={"k": 6}
+                search_kwargs={"k": 4}
             ),
             memory=memory,
             verbose=True,
@@ -209,8 +236,6 @@ class CorporateChatbot:
             response = self.conversation_chain.invoke({"question": question})
             answer = response.get("answer", "Não consegui encontrar uma resposta.")
             
-            self.chat_history.append({"question": question, "answer": answer})
-            
             return answer
         except Exception as e:
             print(f"Erro ao processar a pergunta: {e}")
@@ -1,11 +1,18 @@
+import asyncio
 import os
 
+import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("api_key"))
+_http = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    timeout=90.0
+)
+client = AsyncOpenAI(api_key=os.getenv("api_key"), http_client=_http)
 
 def read_markdown(file_path):
     """Read the content of a markdown file"""
@@ -19,9 +26,9 @@ def save_markdown(content, file_path):
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(content)
 
-def process_command(command, current_content):
+async def process_command(command, current_content):
     """Use OpenAI to process natural language command and update markdown content"""
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": "You are a project management agent. Based on the user's natural language command and the current markdown content, update the markdown file accordingly. Support commands like: create task/issue, assign to someone, add comment. Output ONLY the updated markdown content, no explanations. Structure tasks as: ## Task ID: Title\n- Assigned: Person\n- Status: Open/Closed\n### Comments\n- Comment text"},
@@ -30,7 +37,7 @@ def process_command(command, current_content):
     )
     return response.choices[0].message.content
 
-if __name__ == "__main__":
+async def main():
     current_dir = os.path.dirname(os.path.abspath(__file__))
     output_dir = os.path.join(os.path.dirname(current_dir), "outputs")
     os.makedirs(output_dir, exist_ok=True)
@@ -51,8 +58,13 @@ if __name__ == "__main__":
     
     for cmd in commands:
         print(f"Processing command: {cmd}")
-        updated_content = process_command(cmd, current_content)
+        updated_content = await process_command(cmd, current_content)
         save_markdown(updated_content, md_path)
         current_content = updated_content
     
-    print(f"Project management markdown updated and saved to {md_path}") 
\ No newline at end of file
+    await _http.aclose()
+    
+    print(f"Project management markdown updated and saved to {md_path}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
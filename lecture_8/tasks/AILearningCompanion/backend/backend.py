@@ -1,16 +1,43 @@
+import asyncio
 import os
 import random
+from collections import OrderedDict
+from string import Formatter
+from typing import List, Optional
 
+import httpx
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
-from openai import OpenAI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("api_key"))
+_http = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    timeout=90.0
+)
+client = AsyncOpenAI(api_key=os.getenv("api_key"), http_client=_http)
+
+app = FastAPI(title="AI Learning Companion Backend", default_response_class=ORJSONResponse)
+# Rotas de streaming ficam fora da compressão: versões do Starlette que não isentam
+# text/event-stream guardariam os eventos no buffer do zlib até o fim da resposta
+STREAM_PATHS = {"/generate-material/stream"}
+
+class StreamAwareGZipMiddleware(GZipMiddleware):
+    """Comprime as respostas, exceto as das rotas de streaming"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in STREAM_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1024)
 
-app = FastAPI(title="AI Learning Companion Backend")
 class TopicRequest(BaseModel):
     topic: str
     difficulty: str = "intermediário"
@@ -24,6 +51,15 @@ class QuizAnswerRequest(BaseModel):
     user_answer: str
     topic: str
 
+class AnswerItem(BaseModel):
+    question: str
+    user_answer: str
+    correct_answer: str = ""
+
+class BatchEvaluationRequest(BaseModel):
+    topic: str
+    answers: List[AnswerItem]
+
 
 LEARNING_MATERIAL_PROMPT = """
 Você é um assistente educacional especializado em criar materiais de aprendizado concisos e informativos.
@@ -43,22 +79,24 @@ Com base no seguinte material de aprendizado sobre {topic}:
 
 Crie 3 perguntas de múltipla escolha para avaliar o entendimento do aluno sobre este material.
 Cada pergunta deve ter 4 alternativas (a, b, c, d), com apenas uma resposta correta.
-Formate a saída da seguinte maneira:
-
-[
-  {{
-    "question": "Pergunta 1?",
-    "options": {{
-      "a": "Opção A",
-      "b": "Opção B",
-      "c": "Opção C",
-      "d": "Opção D"
+Retorne JSON válido no seguinte formato:
+
+{{
+  "questions": [
+    {{
+      "question": "Pergunta 1?",
+      "options": {{
+        "a": "Opção A",
+        "b": "Opção B",
+        "c": "Opção C",
+        "d": "Opção D"
+      }},
+      "correct_answer": "a",
+      "explanation": "Explicação breve sobre por que esta é a resposta correta"
     }},
-    "correct_answer": "a",
-    "explanation": "Explicação breve sobre por que esta é a resposta correta"
-  }},
-  ...
-]
+    ...
+  ]
+}}
 """
 
 ANSWER_EVALUATION_PROMPT = """
@@ -72,7 +110,7 @@ Forneça:
 2. Uma explicação detalhada sobre por que está correta ou incorreta
 3. Uma pontuação de 0 a 10 para a resposta
 
-Formate a saída como um objeto JSON:
+Retorne JSON válido no seguinte formato:
 {{
   "is_correct": true/false,
   "explanation": "Sua explicação aqui",
@@ -80,42 +118,160 @@ Formate a saída como um objeto JSON:
 }}
 """
 
+BATCH_EVALUATION_PROMPT = """
+Avalie as respostas do usuário para as seguintes perguntas sobre {topic}:
+
+{answers}
+
+A correção já foi feita com base na resposta correta informada em cada pergunta.
+Para cada pergunta, na mesma ordem em que aparecem, forneça uma explicação detalhada
+sobre por que a resposta do usuário está correta ou incorreta.
+
+Retorne JSON válido com um objeto por pergunta no seguinte formato:
+{{
+  "evaluations": [
+    {{
+      "explanation": "Sua explicação aqui"
+    }},
+    ...
+  ]
+}}
+"""
+
+def _compile_prompt(template: str):
+    """Analisa o template uma única vez e retorna uma função que apenas concatena os campos"""
+    parts = [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+    
+    def render(**fields) -> str:
+        return "".join(
+            literal + (str(fields[field]) if field is not None else "")
+            for literal, field in parts
+        )
+    
+    return render
+
+build_material_prompt = _compile_prompt(LEARNING_MATERIAL_PROMPT)
+build_quiz_prompt = _compile_prompt(QUIZ_GENERATION_PROMPT)
+build_evaluation_prompt = _compile_prompt(ANSWER_EVALUATION_PROMPT)
+build_batch_evaluation_prompt = _compile_prompt(BATCH_EVALUATION_PROMPT)
+
+MATERIAL_CACHE_SIZE = 256
+material_cache = OrderedDict()
+material_cache_lock = asyncio.Lock()
+
+def _material_cache_key(request: TopicRequest) -> tuple:
+    return (request.topic.strip().lower(), request.difficulty.lower())
+
+async def get_cached_material(key: tuple):
+    """Retorna o material já gerado para (tópico, dificuldade), se existir"""
+    async with material_cache_lock:
+        material = material_cache.get(key)
+        if material is not None:
+            material_cache.move_to_end(key)
+        return material
+
+async def store_material(key: tuple, material: str):
+    """Guarda o material gerado, descartando o menos usado quando o cache enche"""
+    async with material_cache_lock:
+        material_cache[key] = material
+        material_cache.move_to_end(key)
+        if len(material_cache) > MATERIAL_CACHE_SIZE:
+            material_cache.popitem(last=False)
+
 
 @app.post("/generate-material")
 async def generate_material(request: TopicRequest):
     """Gera material de aprendizado para um tópico específico"""
     try:
-        prompt = LEARNING_MATERIAL_PROMPT.format(
+        cache_key = _material_cache_key(request)
+        material = await get_cached_material(cache_key)
+        if material is not None:
+            return {"material": material}
+        
+        prompt = build_material_prompt(
             topic=request.topic, 
             difficulty=request.difficulty
         )
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "system", "content": prompt}],
             temperature=0.7,
             timeout=90.0
         )
         
-        return {"material": response.choices[0].message.content}
+        material = response.choices[0].message.content
+        await store_material(cache_key, material)
+        return {"material": material}
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao gerar material: {str(e)}")
 
+def _sse(data: str, event: Optional[str] = None) -> bytes:
+    """Monta um evento SSE; o texto vai como string JSON para que quebras de linha não encerrem o evento"""
+    frame = b"data: " + orjson.dumps(data) + b"\n\n"
+    return b"event: " + event.encode() + b"\n" + frame if event else frame
+
+@app.post("/generate-material/stream")
+async def stream_material(request: TopicRequest):
+    """
+    Gera material de aprendizado enviando o texto em partes à medida que o modelo o produz.
+    Cada parte é um evento SSE; o fluxo termina com um evento "done", ou "error" se o modelo falhar no meio
+    """
+    cache_key = _material_cache_key(request)
+    material = await get_cached_material(cache_key)
+    if material is not None:
+        return StreamingResponse(iter([_sse(material), _sse("", "done")]), media_type="text/event-stream")
+    
+    try:
+        prompt = build_material_prompt(
+            topic=request.topic, 
+            difficulty=request.difficulty
+        )
+        
+        stream = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "system", "content": prompt}],
+            temperature=0.7,
+            timeout=90.0,
+            stream=True
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao gerar material: {str(e)}")
+    
+    async def generate():
+        parts = []
+        try:
+            async for chunk in stream:
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content or ""
+                    if content:
+                        parts.append(content)
+                        yield _sse(content)
+        except Exception as e:
+            # Material incompleto não vai para o cache
+            yield _sse(f"Erro ao gerar material: {str(e)}", "error")
+            return
+        await store_material(cache_key, "".join(parts))
+        yield _sse("", "done")
+    
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
 @app.post("/generate-quiz")
 async def generate_quiz(request: QuizRequest):
     """Gera perguntas de quiz baseadas no material de aprendizado"""
     try:
-        prompt = QUIZ_GENERATION_PROMPT.format(
+        prompt = build_quiz_prompt(
             topic=request.topic,
             material=request.material
         )
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "system", "content": prompt}],
             temperature=0.7,
-            timeout=90.0
+            timeout=90.0,
+            response_format={"type": "json_object"}
         )
         
         return {"quiz": response.choices[0].message.content}
@@ -127,17 +283,18 @@ async def generate_quiz(request: QuizRequest):
 async def evaluate_answer(request: QuizAnswerRequest):
     """Avalia a resposta do usuário para uma pergunta do quiz"""
     try:
-        prompt = ANSWER_EVALUATION_PROMPT.format(
+        prompt = build_evaluation_prompt(
             topic=request.topic,
             question=request.question,
             user_answer=request.user_answer
         )
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "system", "content": prompt}],
             temperature=0.3,
-            timeout=90.0
+            timeout=90.0,
+            response_format={"type": "json_object"}
         )
         
         return {"evaluation": response.choices[0].message.content}
@@ -145,6 +302,46 @@ async def evaluate_answer(request: QuizAnswerRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao avaliar resposta: {str(e)}")
 
+@app.post("/evaluate-batch")
+async def evaluate_batch(request: BatchEvaluationRequest):
+    """Avalia todas as respostas de um quiz em uma única chamada ao modelo"""
+    try:
+        answers = "\n\n".join(
+            f"Pergunta {number}: {item.question}\nResposta do usuário: {item.user_answer}"
+            f"\nResposta correta: {item.correct_answer}"
+            for number, item in enumerate(request.answers, 1)
+        )
+        prompt = build_batch_evaluation_prompt(
+            topic=request.topic,
+            answers=answers
+        )
+        
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "system", "content": prompt}],
+            temperature=0.3,
+            timeout=90.0,
+            response_format={"type": "json_object"}
+        )
+        
+        return {"evaluations": response.choices[0].message.content}
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao avaliar respostas: {str(e)}")
+
+@app.on_event("startup")
+async def warm_http_client():
+    """Abre a conexão com a OpenAI na inicialização para que a primeira requisição já a encontre pronta"""
+    try:
+        await client.models.list()
+    except Exception:
+        pass
+
+@app.on_event("shutdown")
+async def close_http_client():
+    """Fecha o pool de conexões HTTP compartilhado com a OpenAI"""
+    await _http.aclose()
+
 @app.get("/health")
 async def health_check():
     """Endpoint para verificar se o servidor está funcionando"""
@@ -1,25 +1,80 @@
 import asyncio
-import json
+import codecs
+import html
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
-import requests
-from nicegui import ui
+from nicegui import app, ui
+
+# aiohttp, markdown e orjson só são importados no primeiro uso, para acelerar a abertura da janela
+if TYPE_CHECKING:
+    import aiohttp
 
 BACKEND_URL = "http://localhost:8000"
+RETRY_STATUSES = {500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
 DIFFICULTY_OPTIONS = ["básico", "intermediário", "avançado"]
 
+@lru_cache(maxsize=256)
+def render_md(text: str) -> str:
+    """Converte Markdown em HTML, reaproveitando o resultado para textos já renderizados"""
+    return markdown_to_html(text)
+
+def markdown_to_html(text: str) -> str:
+    """Converte Markdown em HTML sem cache, para textos que ainda estão mudando"""
+    import markdown
+    return markdown.markdown(text, extensions=["fenced_code"])
+
+class MarkdownStream:
+    """
+    Renderiza Markdown recebido em partes: blocos concluídos (separados por linha em branco)
+    são renderizados uma única vez e apenas o bloco final, ainda incompleto, é atualizado
+    """
+    def __init__(self):
+        self.text = ""
+        self.buffer = ""
+        self.container = ui.column().classes("w-full")
+        with self.container:
+            self.trailing = ui.html("")
+    
+    def append(self, chunk: str):
+        self.text += chunk
+        self.buffer += chunk
+        
+        start = 0
+        while True:
+            index = self.buffer.find("\n\n", start)
+            if index == -1:
+                break
+            block = self.buffer[:index]
+            # Uma linha em branco dentro de um bloco de código não encerra o bloco
+            if block.count("```") % 2:
+                start = index + 2
+                continue
+            self._freeze(block)
+            self.buffer = self.buffer[index + 2:]
+            start = 0
+        
+        self.trailing.set_content(markdown_to_html(self.buffer))
+    
+    def finish(self) -> str:
+        self.trailing.set_content(render_md(self.buffer))
+        self.buffer = ""
+        return self.text
+    
+    def _freeze(self, block: str):
+        self.trailing.set_content(render_md(block))
+        with self.container:
+            self.trailing = ui.html("")
+
 def get_selected_option_text(selected_value, options_dict):
     """
     Extrai o texto da opção selecionada, lidando com diferentes formatos de valor retornado pelo radio
     """
     if not selected_value:
         return ""
-    
-    if isinstance(selected_value, tuple):
-        key = selected_value[0]
-    else:
-        key = selected_value
-    
-    return options_dict.get(key, "")
+    return options_dict.get(selected_value[0] if type(selected_value) is tuple else selected_value, "")
 
 root = None
 
@@ -31,9 +86,20 @@ class AppState:
         self.quiz_data = []
         self.current_question_index = 0
         self.user_answers = []
+        self.total_score = 0
         self.score = 0
         self.total_questions = 0
         self.quiz_completed = False
+        self.http_session = None
+        self.pending_quiz = None
+        self.loading_overlay = None
+        self.loading_label = None
+        self.question_card = None
+        self.question_title = None
+        self.question_md = None
+        self.options_group = None
+        self.submit_btn = None
+        self.feedback_card = None
 
 app_state = AppState()
 
@@ -42,50 +108,131 @@ def clear_ui():
     if root:
         root.clear()
 
+def show_loading(text: str):
+    """Exibe o overlay de carregamento com a mensagem informada"""
+    app_state.loading_label.text = text
+    app_state.loading_overlay.classes(remove="hidden")
 
-async def generate_material(topic: str, difficulty: str) -> str:
-    """Solicita material de aprendizado ao backend"""
-    try:
-        response = requests.post(
-            f"{BACKEND_URL}/generate-material",
-            json={"topic": topic, "difficulty": difficulty},
-            timeout=120
+def hide_loading():
+    """Oculta o overlay de carregamento"""
+    app_state.loading_overlay.classes(add="hidden")
+
+
+def get_http_session() -> "aiohttp.ClientSession":
+    """Retorna a sessão HTTP compartilhada com o backend, criando-a no primeiro uso"""
+    import aiohttp
+    if app_state.http_session is None or app_state.http_session.closed:
+        # Mantém a conexão ociosa aberta pelo mesmo tempo que o backend (timeout_keep_alive=120)
+        app_state.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(keepalive_timeout=120),
+            timeout=aiohttp.ClientTimeout(total=120, connect=5)
         )
-        response.raise_for_status()
-        return response.json()["material"]
+    return app_state.http_session
+
+async def close_http_session():
+    """Fecha a sessão HTTP compartilhada ao encerrar a aplicação"""
+    if app_state.http_session is not None and not app_state.http_session.closed:
+        await app_state.http_session.close()
+
+app.on_shutdown(close_http_session)
+
+async def post_with_retry(path: str, payload: dict) -> "aiohttp.ClientResponse":
+    """Envia um POST ao backend, repetindo com espera exponencial em falhas transitórias"""
+    import aiohttp
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await get_http_session().post(f"{BACKEND_URL}{path}", json=payload)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                response.raise_for_status()
+                return response
+            response.release()
+        await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+
+
+def parse_sse_event(event: str) -> tuple:
+    """Separa um evento SSE em (nome, texto); o campo data chega como string JSON"""
+    import orjson
+    name, data = "message", ""
+    for line in event.split("\n"):
+        if line.startswith("event:"):
+            name = line[6:].strip()
+        elif line.startswith("data:"):
+            data = orjson.loads(line[5:])
+    return name, data
+
+async def generate_material(topic: str, difficulty: str, on_chunk=None) -> Optional[str]:
+    """Solicita material de aprendizado ao backend, repassando cada trecho recebido a on_chunk; retorna None em caso de erro"""
+    try:
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
+        material = ""
+        done = False
+        async with await post_with_retry(
+            "/generate-material/stream",
+            {"topic": topic, "difficulty": difficulty}
+        ) as response:
+            async for data in response.content.iter_any():
+                buffer += decoder.decode(data)
+                *events, buffer = buffer.split("\n\n")
+                for event in events:
+                    name, chunk = parse_sse_event(event)
+                    if name == "error":
+                        raise RuntimeError(chunk)
+                    if name == "done":
+                        done = True
+                    elif chunk:
+                        material += chunk
+                        if on_chunk:
+                            on_chunk(chunk)
+        # Sem o evento final o texto foi cortado no meio
+        if not done:
+            raise RuntimeError("a resposta do servidor terminou antes do fim do material")
+        return material
     except Exception as e:
         ui.notify(f"Erro ao gerar material: {str(e)}", color="negative")
-        return f"Erro ao gerar material: {str(e)}"
+        return None
 
 async def generate_quiz(topic: str, material: str) -> list:
     """Solicita perguntas de quiz ao backend"""
+    import orjson
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/generate-quiz",
-            json={"topic": topic, "material": material},
-            timeout=120
-        )
-        response.raise_for_status()
-        quiz_text = response.json()["quiz"]
-        return json.loads(quiz_text)
+        async with await post_with_retry(
+            "/generate-quiz",
+            {"topic": topic, "material": material}
+        ) as response:
+            data = await response.json(loads=orjson.loads)
+        return orjson.loads(data["quiz"])["questions"]
     except Exception as e:
         ui.notify(f"Erro ao gerar quiz: {str(e)}", color="negative")
         return []
 
-async def evaluate_answer(question: str, user_answer: str, topic: str) -> dict:
-    """Solicita avaliação de resposta ao backend"""
+async def evaluate_answers(topic: str, answers: list) -> list:
+    """Solicita ao backend a avaliação de todas as respostas do quiz em uma única requisição"""
+    import orjson
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/evaluate-answer",
-            json={"question": question, "user_answer": user_answer, "topic": topic},
-            timeout=120
-        )
-        response.raise_for_status()
-        evaluation_text = response.json()["evaluation"]
-        return json.loads(evaluation_text)
+        async with await post_with_retry(
+            "/evaluate-batch",
+            {
+                "topic": topic,
+                "answers": [
+                    {
+                        "question": answer["question"],
+                        "user_answer": answer["user_answer"],
+                        "correct_answer": answer["correct_answer"]
+                    }
+                    for answer in answers
+                ]
+            }
+        ) as response:
+            data = await response.json(loads=orjson.loads)
+        return orjson.loads(data["evaluations"])["evaluations"]
     except Exception as e:
-        ui.notify(f"Erro ao avaliar resposta: {str(e)}", color="negative")
-        return {"is_correct": False, "explanation": f"Erro: {str(e)}", "score": 0}
+        ui.notify(f"Erro ao avaliar respostas: {str(e)}", color="negative")
+        return []
 
 
 def create_topic_selection():
@@ -107,72 +254,90 @@ def create_topic_selection():
             with ui.row().classes("w-full justify-center"):
                 ui.button("Começar a aprender", on_click=lambda: start_learning(topic_input.value, difficulty_select.value))
 
-def create_learning_material(material: str):
-    """Cria a tela de material de aprendizado"""
+def create_learning_material():
+    """Cria a tela de material de aprendizado, preenchida à medida que o material chega"""
     with root:
         with ui.card().classes("w-full max-w-3xl mx-auto p-4"):
             ui.label(f"Material de Aprendizado: {app_state.current_topic}").classes("text-h5 mb-4")
             
             with ui.card().classes("w-full p-4 mb-4"):
-                ui.markdown(material)
+                material_stream = MarkdownStream()
             
             with ui.row().classes("w-full justify-center"):
-                ui.button("Iniciar Quiz", on_click=start_quiz)
+                quiz_button = ui.button("Iniciar Quiz", on_click=start_quiz)
+                quiz_button.disable()
+    
+    return material_stream, quiz_button
 
-def create_quiz_question(question_data: dict, question_number: int, total_questions: int):
-    """Cria a tela de pergunta do quiz"""
+def create_quiz_view():
+    """Cria, uma única vez por quiz, os elementos da tela de perguntas e de feedback"""
     with root:
-        with ui.card().classes("w-full max-w-3xl mx-auto p-4"):
-            ui.label(f"Pergunta {question_number} de {total_questions}").classes("text-h5 mb-4")
-            
-            ui.markdown(question_data["question"]).classes("mb-4 font-bold")
-            
-            options_group = ui.radio(
-                options=[
-                    (key, f"{key}: {option}")
-                    for key, option in question_data["options"].items()
-                ],
-                value=None
-            ).classes("w-full mb-4")
+        with ui.card().classes("w-full max-w-3xl mx-auto p-4") as question_card:
+            app_state.question_title = ui.label("").classes("text-h5 mb-4")
+            app_state.question_md = ui.html("").classes("mb-4 font-bold")
+            app_state.options_group = ui.radio(options=[], value=None).classes("w-full mb-4")
             
             with ui.row().classes("w-full justify-center"):
-                submit_btn = ui.button(
-                    "Enviar Resposta",
-                    on_click=lambda: submit_answer(
-                        question_data["question"],
-                        get_selected_option_text(options_group.value, question_data["options"]),
-                        question_data["correct_answer"]
-                    )
-                )
-                submit_btn.disable()
-                
-
-                def on_option_change():
-                    if options_group.value:
-                        submit_btn.enable()
-                    else:
-                        submit_btn.disable()
-                
-                options_group.on_value_change(on_option_change)
+                app_state.submit_btn = ui.button("Enviar Resposta", on_click=on_submit_answer)
+                app_state.submit_btn.disable()
+        
+        app_state.feedback_card = ui.card().classes("w-full max-w-3xl mx-auto p-4")
+        app_state.feedback_card.set_visibility(False)
+    
+    app_state.question_card = question_card
+    
+    def on_option_change():
+        if app_state.options_group.value:
+            app_state.submit_btn.enable()
+        else:
+            app_state.submit_btn.disable()
+    
+    app_state.options_group.on_value_change(on_option_change)
+
+def show_question(index: int):
+    """Atualiza a tela do quiz com a pergunta indicada, sem recriar os elementos"""
+    question_data = app_state.quiz_data[index]
+    
+    app_state.question_title.text = f"Pergunta {index + 1} de {app_state.total_questions}"
+    app_state.question_md.set_content(render_md(question_data["question"]))
+    app_state.options_group.options = question_data["_radio_opts"]
+    app_state.options_group.value = None
+    app_state.options_group.update()
+    app_state.submit_btn.disable()
+    
+    app_state.feedback_card.set_visibility(False)
+    app_state.question_card.set_visibility(True)
+
+def on_submit_answer():
+    """Envia a resposta selecionada para a pergunta atual"""
+    question_data = app_state.quiz_data[app_state.current_question_index]
+    submit_answer(
+        question_data["question"],
+        get_selected_option_text(app_state.options_group.value, question_data["options"]),
+        question_data["correct_answer"]
+    )
 
 def create_answer_feedback(evaluation: dict, correct_answer: str):
     """Cria a tela de feedback da resposta"""
-    with root:
-        with ui.card().classes("w-full max-w-3xl mx-auto p-4"):
-            if evaluation["is_correct"]:
-                ui.label("Resposta Correta!").classes("text-h5 text-green-600 mb-4")
+    app_state.question_card.set_visibility(False)
+    app_state.feedback_card.clear()
+    app_state.feedback_card.set_visibility(True)
+    
+    with app_state.feedback_card:
+        if evaluation["is_correct"]:
+            ui.label("Resposta Correta!").classes("text-h5 text-green-600 mb-4")
+        else:
+            ui.label("Resposta Incorreta").classes("text-h5 text-red-600 mb-4")
+            ui.label(f"A resposta correta era: {correct_answer}").classes("font-bold mb-2")
+        
+        ui.html(f"<p><b>Explicação:</b> {html.escape(evaluation['explanation'])}</p>").classes("mb-4")
+        ui.label(f"Pontuação: {evaluation['score']}/10").classes("text-h6 mb-4")
+        
+        with ui.row().classes("w-full justify-center"):
+            if app_state.current_question_index < app_state.total_questions - 1:
+                ui.button("Próxima Pergunta", on_click=next_question)
             else:
-                ui.label("Resposta Incorreta").classes("text-h5 text-red-600 mb-4")
-                ui.label(f"A resposta correta era: {correct_answer}").classes("font-bold mb-2")
-            
-            ui.markdown(f"**Explicação:** {evaluation['explanation']}").classes("mb-4")
-            ui.label(f"Pontuação: {evaluation['score']}/10").classes("text-h6 mb-4")
-            
-            with ui.row().classes("w-full justify-center"):
-                if app_state.current_question_index < app_state.total_questions - 1:
-                    ui.button("Próxima Pergunta", on_click=next_question)
-                else:
-                    ui.button("Ver Resultado Final", on_click=show_final_score)
+                ui.button("Ver Resultado Final", on_click=show_final_score)
 
 def create_final_score():
     """Cria a tela de pontuação final"""
@@ -181,8 +346,7 @@ def create_final_score():
             ui.label("Quiz Concluído!").classes("text-h4 text-center mb-4")
             ui.label(f"Tópico: {app_state.current_topic}").classes("text-h6 mb-2")
             
-            total_score = sum(answer["score"] for answer in app_state.user_answers)
-            average_score = total_score / len(app_state.user_answers) if app_state.user_answers else 0
+            average_score = app_state.total_score / len(app_state.user_answers) if app_state.user_answers else 0
             
             ui.label(f"Pontuação Final: {average_score:.1f}/10").classes("text-h5 text-center mb-4")
             
@@ -196,6 +360,12 @@ def create_final_score():
             
             ui.label(performance).classes("text-center mb-4")
             
+            for number, answer in enumerate(app_state.user_answers, 1):
+                with ui.card().classes("w-full p-4 mb-2"):
+                    result = "Correta" if answer["is_correct"] else "Incorreta"
+                    ui.label(f"Pergunta {number}: {result} ({answer['score']}/10)").classes("font-bold")
+                    ui.html(f"<p>{html.escape(answer['explanation'])}</p>")
+            
             with ui.row().classes("w-full justify-center"):
                 ui.button("Escolher Novo Tópico", on_click=reset_app)
 
@@ -210,28 +380,47 @@ async def start_learning(topic: str, difficulty: str):
     app_state.current_difficulty = difficulty
     
     clear_ui()
+    material_stream, quiz_button = create_learning_material()
     
-    with root:
-        with ui.card().classes("w-full max-w-3xl mx-auto p-4 text-center"):
-            ui.label("Gerando material de aprendizado...").classes("text-h5")
-            spinner = ui.spinner(size="lg")
+    def on_chunk(chunk: str):
+        hide_loading()
+        material_stream.append(chunk)
+    
+    show_loading("Gerando material de aprendizado...")
+    material = await generate_material(topic, difficulty, on_chunk)
+    hide_loading()
+    cancel_pending_quiz()
+    if material is None:
+        # Sem o material completo não há sobre o que perguntar: o quiz não é gerado
+        material_stream.append("\n\n**Erro ao gerar material. Tente novamente.**")
+        material_stream.finish()
+        app_state.learning_material = ""
+        return
     
-    material = await generate_material(topic, difficulty)
-    app_state.learning_material = material
+    if not material_stream.text:
+        material_stream.append(material)
+    app_state.learning_material = material_stream.finish()
     
-    clear_ui()
-    create_learning_material(material)
+    # O quiz depende apenas do tópico e do material: gera em paralelo enquanto o usuário lê
+    app_state.pending_quiz = asyncio.create_task(generate_quiz(topic, material))
+    quiz_button.enable()
 
 async def start_quiz():
     """Inicia o quiz"""
-    clear_ui()
+    show_loading("Gerando perguntas...")
     
-    with root:
-        with ui.card().classes("w-full max-w-3xl mx-auto p-4 text-center"):
-            ui.label("Gerando perguntas...").classes("text-h5")
-            spinner = ui.spinner(size="lg")
+    if app_state.pending_quiz is None:
+        app_state.pending_quiz = asyncio.create_task(
+            generate_quiz(app_state.current_topic, app_state.learning_material)
+        )
     
-    quiz_data = await generate_quiz(app_state.current_topic, app_state.learning_material)
+    try:
+        quiz_data = await app_state.pending_quiz
+    except Exception:
+        quiz_data = []
+    finally:
+        app_state.pending_quiz = None
+        hide_loading()
     
     if not quiz_data:
         ui.notify("Erro ao gerar o quiz. Tente novamente.", color="negative")
@@ -239,60 +428,80 @@ async def start_quiz():
         create_topic_selection()
         return
     
+    # As opções do radio são montadas uma única vez por pergunta, ao carregar o quiz
+    for question_data in quiz_data:
+        question_data["_radio_opts"] = [
+            (key, f"{key}: {option}")
+            for key, option in question_data["options"].items()
+        ]
+    
     app_state.quiz_data = quiz_data
     app_state.total_questions = len(quiz_data)
     app_state.current_question_index = 0
     app_state.user_answers = []
+    app_state.total_score = 0
     app_state.quiz_completed = False
     
     clear_ui()
-    create_quiz_question(
-        quiz_data[0],
-        1,
-        app_state.total_questions
-    )
+    create_quiz_view()
+    show_question(0)
 
-async def submit_answer(question: str, user_answer: str, correct_option: str):
+def submit_answer(question: str, user_answer: str, correct_option: str):
     """Processa a resposta do usuário"""
-    clear_ui()
-    
-    with root:
-        with ui.card().classes("w-full max-w-3xl mx-auto p-4 text-center"):
-            ui.label("Avaliando resposta...").classes("text-h5")
-            spinner = ui.spinner(size="lg")
+    question_data = app_state.quiz_data[app_state.current_question_index]
+    correct_answer = question_data["options"][correct_option]
     
-    correct_answer = app_state.quiz_data[app_state.current_question_index]["options"][correct_option]
-    
-    evaluation = await evaluate_answer(question, user_answer, app_state.current_topic)
+    # A resposta correta já vem no quiz: a correção é feita localmente e a explicação
+    # detalhada é pedida ao backend uma única vez, ao final do quiz
+    is_correct = user_answer == correct_answer
+    evaluation = {
+        "question": question,
+        "user_answer": user_answer,
+        "correct_answer": correct_answer,
+        "is_correct": is_correct,
+        "explanation": question_data.get("explanation", ""),
+        "score": 10 if is_correct else 0
+    }
     app_state.user_answers.append(evaluation)
+    app_state.total_score += evaluation["score"]
     
-    clear_ui()
     create_answer_feedback(evaluation, f"{correct_option}: {correct_answer}")
 
 def next_question():
     """Avança para a próxima pergunta"""
     app_state.current_question_index += 1
-    
-    clear_ui()
-    create_quiz_question(
-        app_state.quiz_data[app_state.current_question_index],
-        app_state.current_question_index + 1,
-        app_state.total_questions
-    )
+    show_question(app_state.current_question_index)
 
-def show_final_score():
+async def show_final_score():
     """Mostra a pontuação final"""
     app_state.quiz_completed = True
+    
+    show_loading("Avaliando respostas...")
+    evaluations = await evaluate_answers(app_state.current_topic, app_state.user_answers)
+    hide_loading()
+    # A nota continua sendo a da correção local; do modelo vem apenas a explicação
+    for answer, evaluation in zip(app_state.user_answers, evaluations):
+        if isinstance(evaluation, dict):
+            answer["explanation"] = evaluation.get("explanation", answer["explanation"])
+    
     clear_ui()
     create_final_score()
 
+def cancel_pending_quiz():
+    """Cancela a geração antecipada do quiz, se ainda estiver em andamento"""
+    if app_state.pending_quiz is not None:
+        app_state.pending_quiz.cancel()
+        app_state.pending_quiz = None
+
 def reset_app():
     """Reinicia a aplicação"""
+    cancel_pending_quiz()
     app_state.current_topic = ""
     app_state.learning_material = ""
     app_state.quiz_data = []
     app_state.current_question_index = 0
     app_state.user_answers = []
+    app_state.total_score = 0
     app_state.quiz_completed = False
     
     clear_ui()
@@ -315,6 +524,15 @@ def main_page():
     
     global root
     root = ui.column().classes("w-full items-center")
+    
+    # Criado uma única vez, fora de root, e apenas exibido/ocultado nas transições
+    app_state.loading_overlay = ui.card().classes(
+        "fixed inset-0 m-auto w-96 h-40 items-center justify-center text-center z-50 hidden"
+    )
+    with app_state.loading_overlay:
+        app_state.loading_label = ui.label("").classes("text-h5")
+        ui.spinner(size="lg")
+    
     create_topic_selection()
 
 
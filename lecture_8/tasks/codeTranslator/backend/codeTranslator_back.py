@@ -1,43 +1,191 @@
+import asyncio
+import hashlib
 import os
+import re
+from collections import OrderedDict
+from typing import Optional
 
+import httpx
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
-from openai import OpenAI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("api_key"))
+_http = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    timeout=90.0
+)
+client = AsyncOpenAI(api_key=os.getenv("api_key"), http_client=_http)
+
+app = FastAPI(title="AI Code Translator Backend", default_response_class=ORJSONResponse)
+# Rotas de streaming ficam fora da compressão: versões do Starlette que não isentam
+# text/event-stream guardariam os eventos no buffer do zlib até o fim da resposta
+STREAM_PATHS = {"/translate/stream"}
+
+class StreamAwareGZipMiddleware(GZipMiddleware):
+    """Comprime as respostas, exceto as das rotas de streaming"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in STREAM_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1024)
+
+CODE_FENCE_PATTERN = re.compile(r"^```[ \t]*([\w#+-]+)?[^\n]*\n(.*?)\n?```$", re.DOTALL)
 
-app = FastAPI(title="AI Code Translator Backend")
+TRANSLATION_CACHE_SIZE = 1024
+translation_cache = OrderedDict()
+translation_cache_lock = asyncio.Lock()
 
 class TranslationRequest(BaseModel):
     user_code: str
     target_language: str
 
-SYSTEM_PROMPT = (
+_PROMPT_PREFIX = (
     "Você é um assistente especialista em tradução de código para outras linguagens. "
     "Dado um trecho de código enviado pelo usuário, traduza-o para a linguagem especificada. "
     "Somente envie o código traduzido, sem explicações. "
     "Retorne a resposta no seguinte formato:\n"
-    "``` {request.target_language.lower()}\n<code traduzido>\n```"
 )
 
+def _cache_key(request: TranslationRequest) -> tuple:
+    return (
+        hashlib.blake2b(request.user_code.encode(), digest_size=16).hexdigest(),
+        request.target_language.lower()
+    )
+
+def _messages(request: TranslationRequest) -> list:
+    """Monta as mensagens do pedido de tradução, iguais nas rotas com e sem streaming"""
+    return [
+        {"role": "system", "content": _PROMPT_PREFIX + f"``` {request.target_language.lower()}\n<code traduzido>\n```"},
+        {"role": "user", "content": f"Traduza o seguinte código para {request.target_language}:\n\n{request.user_code}"}
+    ]
+
+async def get_cached_translation(key: tuple) -> Optional[tuple]:
+    """Retorna (código, linguagem) já traduzidos para a chave, se existirem"""
+    async with translation_cache_lock:
+        translation = translation_cache.get(key)
+        if translation is not None:
+            translation_cache.move_to_end(key)
+        return translation
+
+async def store_translation(key: tuple, translation: tuple):
+    """Guarda a tradução, descartando a menos usada quando o cache enche"""
+    async with translation_cache_lock:
+        translation_cache[key] = translation
+        translation_cache.move_to_end(key)
+        if len(translation_cache) > TRANSLATION_CACHE_SIZE:
+            translation_cache.popitem(last=False)
+
+def _sse(data: str, event: Optional[str] = None) -> bytes:
+    """Monta um evento SSE; o texto vai como string JSON para que quebras de linha não encerrem o evento"""
+    frame = b"data: " + orjson.dumps(data) + b"\n\n"
+    return b"event: " + event.encode() + b"\n" + frame if event else frame
+
 @app.post("/translate")
-def translate_code(request: TranslationRequest):
+async def translate_code(request: TranslationRequest):
     if not request.user_code.strip():
         raise HTTPException(status_code=400, detail="Por favor, forneça um trecho de código para tradução.")
-    response = client.chat.completions.create(
+    cache_key = _cache_key(request)
+    cached = await get_cached_translation(cache_key)
+    if cached is not None:
+        code, language = cached
+        return {"code": code, "language": language}
+    
+    response = await client.chat.completions.create(
         model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": f"Traduza o seguinte código para {request.target_language}:\n\n{request.user_code}"}
-        ]
+        messages=_messages(request)
     )
 
     formatted_code = response.choices[0].message.content.strip()
-    return {"translated_code": formatted_code}
+    fence_match = CODE_FENCE_PATTERN.match(formatted_code)
+    if fence_match:
+        translated_code = fence_match.group(2)
+        language = (fence_match.group(1) or cache_key[1]).lower()
+    else:
+        translated_code, language = formatted_code, cache_key[1]
+    
+    await store_translation(cache_key, (translated_code, language))
+    
+    return {"code": translated_code, "language": language}
+
+@app.post("/translate/stream")
+async def stream_translation(request: TranslationRequest):
+    """
+    Traduz o código enviando o resultado em partes, sem o bloco Markdown em volta.
+    Cada parte é um evento SSE; o fluxo termina com um evento "done", ou "error" se o modelo falhar no meio
+    """
+    if not request.user_code.strip():
+        raise HTTPException(status_code=400, detail="Por favor, forneça um trecho de código para tradução.")
+    cache_key = _cache_key(request)
+    cached = await get_cached_translation(cache_key)
+    if cached is not None:
+        return StreamingResponse(iter([_sse(cached[0]), _sse("", "done")]), media_type="text/event-stream")
+    
+    stream = await client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=_messages(request),
+        stream=True
+    )
+    
+    async def generate():
+        sent = []
+        pending = ""
+        header_done = False
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                pending += chunk.choices[0].delta.content or ""
+                if not header_done:
+                    # A primeira linha só é enviada depois de saber se é a abertura do bloco de código
+                    if "\n" not in pending:
+                        continue
+                    pending = pending.lstrip()
+                    if pending.startswith("```"):
+                        pending = pending[pending.index("\n") + 1:]
+                    header_done = True
+                # Os últimos caracteres ficam retidos porque podem ser o fechamento do bloco
+                if len(pending) > 8:
+                    sent.append(pending[:-8])
+                    yield _sse(pending[:-8])
+                    pending = pending[-8:]
+        except Exception as e:
+            # Tradução incompleta não vai para o cache
+            yield _sse(f"Erro ao traduzir: {str(e)}", "error")
+            return
+        
+        pending = pending.rstrip()
+        if pending.endswith("```"):
+            pending = pending[:-3].rstrip("\n")
+        sent.append(pending)
+        yield _sse(pending)
+        
+        await store_translation(cache_key, ("".join(sent), cache_key[1]))
+        yield _sse("", "done")
+    
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+@app.on_event("startup")
+async def warm_http_client():
+    """Abre a conexão com a OpenAI na inicialização para que a primeira requisição já a encontre pronta"""
+    try:
+        await client.models.list()
+    except Exception:
+        pass
+
+@app.on_event("shutdown")
+async def close_http_client():
+    """Fecha o pool de conexões HTTP compartilhado com a OpenAI"""
+    await _http.aclose()
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000, timeout_keep_alive=120) 
\ No newline at end of file
@@ -1,13 +1,113 @@
-import requests
-from nicegui import ui
+import asyncio
+import codecs
+import html
+from collections import OrderedDict
+
+import aiohttp
+import orjson
+from nicegui import app, ui
 
 BACKEND_URL = "http://localhost:8000"
+RETRY_STATUSES = {500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+STREAM_RENDER_EVERY = 8
+TRANSLATION_CACHE_SIZE = 256
+
+http_session = None
+translation_cache = OrderedDict()
+
+def get_cached_translation(key: tuple):
+    """Retorna o HTML já renderizado para (código, linguagem), se existir"""
+    result_html = translation_cache.get(key)
+    if result_html is not None:
+        translation_cache.move_to_end(key)
+    return result_html
+
+def store_translation(key: tuple, result_html: str):
+    """Guarda o HTML renderizado, descartando o menos usado quando o cache enche"""
+    translation_cache[key] = result_html
+    translation_cache.move_to_end(key)
+    if len(translation_cache) > TRANSLATION_CACHE_SIZE:
+        translation_cache.popitem(last=False)
+
+def render_code(code: str, language: str) -> str:
+    """Monta o bloco de código já no formato esperado pelo highlight.js, sem passar pelo Markdown"""
+    return f'<pre><code class="language-{language}">{html.escape(code)}</code></pre>'
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Retorna a sessão HTTP compartilhada com o backend, criando-a no primeiro uso"""
+    global http_session
+    if http_session is None or http_session.closed:
+        # Mantém a conexão ociosa aberta pelo mesmo tempo que o backend (timeout_keep_alive=120)
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(keepalive_timeout=120),
+            timeout=aiohttp.ClientTimeout(total=120, connect=5)
+        )
+    return http_session
+
+async def close_http_session():
+    """Fecha a sessão HTTP compartilhada ao encerrar a aplicação"""
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
 
-async def translate_code(code: str, language: str) -> str:
+app.on_shutdown(close_http_session)
+
+async def post_with_retry(path: str, payload: dict) -> aiohttp.ClientResponse:
+    """Envia um POST ao backend, repetindo com espera exponencial em falhas transitórias"""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await get_http_session().post(f"{BACKEND_URL}{path}", json=payload)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                response.raise_for_status()
+                return response
+            response.release()
+        await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+
+def parse_sse_event(event: str) -> tuple:
+    """Separa um evento SSE em (nome, texto); o campo data chega como string JSON"""
+    name, data = "message", ""
+    for line in event.split("\n"):
+        if line.startswith("event:"):
+            name = line[6:].strip()
+        elif line.startswith("data:"):
+            data = orjson.loads(line[5:])
+    return name, data
+
+async def translate_code(code: str, language: str, on_progress=None) -> str:
+    """Solicita a tradução ao backend, repassando o código parcial a on_progress enquanto chega"""
     try:
-        response = requests.post(f"{BACKEND_URL}/translate", json={"user_code": code, "target_language": language})
-        response.raise_for_status()
-        return response.json()["translated_code"]
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
+        result = ""
+        chunks = 0
+        done = False
+        async with await post_with_retry(
+            "/translate/stream",
+            {"user_code": code, "target_language": language}
+        ) as response:
+            async for data in response.content.iter_any():
+                buffer += decoder.decode(data)
+                *events, buffer = buffer.split("\n\n")
+                for event in events:
+                    name, chunk = parse_sse_event(event)
+                    if name == "error":
+                        raise RuntimeError(chunk)
+                    if name == "done":
+                        done = True
+                    else:
+                        result += chunk
+                        chunks += 1
+                        if on_progress and chunks % STREAM_RENDER_EVERY == 0:
+                            on_progress(result)
+        # Sem o evento final a tradução foi cortada no meio
+        if not done:
+            raise RuntimeError("a resposta do servidor terminou antes do fim da tradução")
+        return result
     except Exception as e:
         return f"Erro: {str(e)}"
 
@@ -59,11 +159,28 @@ def create_ui():
                 ui.label("Por favor, cole um trecho de código para tradução.").classes("text-warning")
             return
         
-        result = await translate_code(code_input.value, language_select.value)
+        key = (code_input.value, language_select.value)
+        language = key[1].lower()
+        result_html = get_cached_translation(key)
         
         result_container.clear()
         with result_container:
-            ui.markdown(result)
+            result_view = ui.html(result_html or "")
+        
+        if result_html is None:
+            # O backend devolve apenas o código, sem o bloco Markdown em volta
+            result = await translate_code(
+                *key,
+                on_progress=lambda code: result_view.set_content(render_code(code, language))
+            )
+            if result.startswith("Erro:"):
+                result_html = f"<p>{html.escape(result)}</p>"
+            else:
+                result_html = render_code(result, language)
+                store_translation(key, result_html)
+            result_view.set_content(result_html)
+        
+        with result_container:
             ui.run_javascript('highlightAll()')
     
     ui.button("Traduzir", on_click=on_translate).classes("mt-4 w-full").props("color=primary")
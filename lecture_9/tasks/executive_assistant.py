@@ -1,14 +1,76 @@
 import hashlib
-import json
+import itertools
+import mmap
+from bisect import bisect_left, bisect_right
 import re
+import string
+import sys
 import time
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Union
-from urllib.parse import quote_plus
+from typing import Dict, List, Optional, Set, Tuple, Union
 
+import ahocorasick
+import orjson
 import requests
 
 
+# The minutes are scanned as raw bytes; only the captured text is decoded. Binary reads keep
+# CRLF and CR line endings, so every lookahead accepts either character as a line end
+_DECISION_RE = re.compile(
+    rb"(?P<tag>DECISION|DECIDED|APPROVED|RESOLUTION|RESOLVED):\s*(?P<body>.*?)(?=[\r\n]|ACTION:|RESPONSIBLE:|$)",
+    re.IGNORECASE | re.MULTILINE
+)
+_ACTION_RE = re.compile(
+    rb"(?P<tag>ACTION ITEM|ACTION|TODO|TASK|FOLLOW-UP):\s*(?P<body>.*?)(?=[\r\n]|DECISION:|RESPONSIBLE:|$)",
+    re.IGNORECASE | re.MULTILINE
+)
+_TOKEN_RE = re.compile(r"\w+")
+
+_SEARCH_URL = "https://html.duckduckgo.com/html/"
+_SEARCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Opening tags of DuckDuckGo result links and titles; counting them needs no scan of the element bodies
+_RESULT_LINK_RE = re.compile(r'<a[^>]*class="result__a"', re.IGNORECASE)
+_RESULT_TITLE_RE = re.compile(r'<h2[^>]*class="result__title"', re.IGNORECASE)
+# Confidence stops growing at this many results (4 * 0.2 = 0.8), so the download can stop there
+_SATURATING_RESULTS = 4
+_VERIFICATION_CACHE_SIZE = 256
+
+# Lowercases ASCII letters only, so match positions in the lowered text stay valid in the original.
+# Slower than str.lower, so it is only used for text that is not pure ASCII
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# One pass for all name forms; names stay on their own line so one match cannot swallow the next
+_RESPONSIBLE_RE = re.compile(
+    rb"RESPONSIBLE:[ \t]*(?P<responsible>[A-Za-z \t]+)(?=[\r\n]|ACTION:|DECISION:|$)"
+    rb"|ASSIGNED TO:[ \t]*(?P<assigned>[A-Za-z \t]+)(?=[\r\n]|ACTION:|DECISION:|$)"
+    rb"|@(?P<mention>[A-Za-z \t]+)"
+    rb"|(?P<subject>[A-Z][a-z]+\s+[A-Z][a-z]+)\s+(?:will|shall|must|should)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+_SENSITIVE_RE = re.compile(
+    "|".join(
+        f"(?:{pattern})"
+        for pattern in (
+            r'\b\d{9}\b',
+            r'\b\d{11}\b',
+            r'\b\d{14}\b',
+            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+            r'\$\s*\d+(?:,\d{3})*(?:\.\d{2})?\b',
+            r'\b(?:confidential|classified|restricted|private)\b'
+        )
+    ),
+    re.IGNORECASE
+)
+# Every sensitive pattern needs a digit, '@', '$' or one of these words, so queries without them skip the sub
+_SENSITIVE_MARKER_RE = re.compile(r'[\d@$]')
+_SENSITIVE_WORDS = ('confidential', 'classified', 'restricted', 'private')
+
+
 class BoardMinutesProcessor:
     """
     Board meeting minutes processor that allows queries about
@@ -17,9 +79,27 @@ class BoardMinutesProcessor:
     
     def __init__(self):
         self.minutes_data: Dict = {}
-        self.decisions: List[Dict] = []
-        self.action_items: List[Dict] = []
+        # Structure of arrays: one list per field, with the same position for each item
+        self.decisions: Dict[str, List[str]] = {
+            'id': [], 'text': [], 'text_lower': [], 'timestamp': []
+        }
+        self.action_items: Dict[str, List[str]] = {
+            'id': [], 'text': [], 'text_lower': [], 'status': [], 'timestamp': []
+        }
         self.responsible_parties: Dict[str, List[str]] = {}
+        self._name_automaton: Optional[ahocorasick.Automaton] = None
+        self._names_lower: Dict[str, str] = {}
+        self._session = requests.Session()
+        self._session.headers.update(_SEARCH_HEADERS)
+        self._now_iso = ""
+        self._verification_cache: OrderedDict = OrderedDict()
+        self._decision_index: Dict[str, Set[int]] = defaultdict(set)
+        self._action_index: Dict[str, Set[int]] = defaultdict(set)
+        # Sorted index tokens, for prefix lookups with bisect
+        self._decision_vocab: List[str] = []
+        self._action_vocab: List[str] = []
+        self._decision_blob: Tuple[str, List[int]] = ("", [])
+        self._action_blob: Tuple[str, List[int]] = ("", [])
         
     def load_minutes(self, file_path: str) -> bool:
         """
@@ -32,110 +112,301 @@ class BoardMinutesProcessor:
             bool: True if loaded successfully, False otherwise
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                self._parse_minutes(content)
+            with open(file_path, 'rb') as file:
+                # The file is paged in on demand instead of being read and decoded up front
+                try:
+                    content = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    content = b""
+                try:
+                    self._parse_minutes(content)
+                finally:
+                    if isinstance(content, mmap.mmap):
+                        content.close()
                 return True
         except Exception as e:
             print(f"Error loading minutes: {e}")
             return False
     
-    def _parse_minutes(self, content: str) -> None:
+    def _parse_minutes(self, content: Union[bytes, mmap.mmap]) -> None:
         """
         Parse minutes content and extract structured information.
         
         Args:
-            content: Full text of the minutes
+            content: Raw UTF-8 bytes of the minutes
         """
+        self._now_iso = datetime.now().isoformat()
         self._extract_decisions(content)
         self._extract_action_items(content)
         self._extract_responsible_parties(content)
+        self._decision_blob = self._build_blob(self.decisions['text_lower'])
+        self._action_blob = self._build_blob(self.action_items['text_lower'])
+        self._decision_vocab = sorted(self._decision_index)
+        self._action_vocab = sorted(self._action_index)
         
-    def _extract_decisions(self, content: str) -> None:
+    def _extract_decisions(self, content: Union[bytes, mmap.mmap]) -> None:
         """
         Extract decisions made from the minutes.
         
         Args:
-            content: Minutes text
-        """
-        decision_patterns = [
-            r"DECISION:\s*(.*?)(?=\n|ACTION:|RESPONSIBLE:|$)",
-            r"DECIDED:\s*(.*?)(?=\n|ACTION:|RESPONSIBLE:|$)",
-            r"APPROVED:\s*(.*?)(?=\n|ACTION:|RESPONSIBLE:|$)",
-            r"RESOLUTION:\s*(.*?)(?=\n|ACTION:|RESPONSIBLE:|$)",
-            r"RESOLVED:\s*(.*?)(?=\n|ACTION:|RESPONSIBLE:|$)"
-        ]
-        
-        for pattern in decision_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                decision_text = match.group(1).strip()
-                if decision_text:
-                    self.decisions.append({
-                        'id': self._generate_id(decision_text),
-                        'text': decision_text,
-                        'type': 'decision',
-                        'timestamp': datetime.now().isoformat()
-                    })
+            content: Raw minutes bytes
+        """
+        for match in _DECISION_RE.finditer(content):
+            decision_text = match.group('body').decode('utf-8', 'replace').strip()
+            if decision_text:
+                text_lower = decision_text.lower()
+                self._index_text(self._decision_index, len(self.decisions['id']), text_lower)
+                self.decisions['id'].append(self._generate_id(decision_text))
+                self.decisions['text'].append(decision_text)
+                self.decisions['text_lower'].append(text_lower)
+                self.decisions['timestamp'].append(self._now_iso)
     
-    def _extract_action_items(self, content: str) -> None:
+    def _extract_action_items(self, content: Union[bytes, mmap.mmap]) -> None:
         """
         Extract action items from the minutes.
         
         Args:
-            content: Minutes text
-        """
-        action_patterns = [
-            r"ACTION:\s*(.*?)(?=\n|DECISION:|RESPONSIBLE:|$)",
-            r"ACTION ITEM:\s*(.*?)(?=\n|DECISION:|RESPONSIBLE:|$)",
-            r"TODO:\s*(.*?)(?=\n|DECISION:|RESPONSIBLE:|$)",
-            r"TASK:\s*(.*?)(?=\n|DECISION:|RESPONSIBLE:|$)",
-            r"FOLLOW-UP:\s*(.*?)(?=\n|DECISION:|RESPONSIBLE:|$)"
+            content: Raw minutes bytes
+        """
+        for match in _ACTION_RE.finditer(content):
+            action_text = match.group('body').decode('utf-8', 'replace').strip()
+            if action_text:
+                text_lower = action_text.lower()
+                self._index_text(self._action_index, len(self.action_items['id']), text_lower)
+                self.action_items['id'].append(self._generate_id(action_text))
+                self.action_items['text'].append(action_text)
+                self.action_items['text_lower'].append(text_lower)
+                self.action_items['status'].append('pending')
+                self.action_items['timestamp'].append(self._now_iso)
+    
+    @staticmethod
+    def _index_text(index: Dict[str, Set[int]], position: int, text_lower: str) -> None:
+        """
+        Add the tokens of an item's text to an inverted index.
+        
+        Args:
+            index: Inverted index mapping token to item positions
+            position: Position of the item in its list
+            text_lower: Lowercased item text
+        """
+        for token in set(_TOKEN_RE.findall(text_lower)):
+            index[token].add(position)
+    
+    @staticmethod
+    def _build_blob(texts_lower: List[str]) -> Tuple[str, List[int]]:
+        """
+        Join item texts into one newline-separated string for substring scans.
+        
+        Args:
+            texts_lower: Lowercased item texts, which never contain newlines
+            
+        Returns:
+            Tuple[str, List[int]]: Joined text and the start offset of each item
+        """
+        offsets = []
+        start = 0
+        for text_lower in texts_lower:
+            offsets.append(start)
+            start += len(text_lower) + 1
+        return "\n".join(texts_lower), offsets
+    
+    @staticmethod
+    def _scan_blob(blob: Tuple[str, List[int]], keyword_lower: str) -> List[int]:
+        """
+        Find the items containing a keyword with str.find over the joined texts.
+        
+        Args:
+            blob: Joined texts and item offsets from _build_blob
+            keyword_lower: Lowercased search keyword
+            
+        Returns:
+            List[int]: Positions of the matching items, in their original order
+        """
+        text, offsets = blob
+        if not keyword_lower:
+            return list(range(len(offsets)))
+        
+        positions = []
+        start = text.find(keyword_lower)
+        while start != -1:
+            position = bisect_right(offsets, start) - 1
+            positions.append(position)
+            if position + 1 == len(offsets):
+                break
+            start = text.find(keyword_lower, offsets[position + 1])
+        return positions
+    
+    @staticmethod
+    def _blob_contains(blob: Tuple[str, List[int]], position: int, keyword_lower: str) -> bool:
+        """
+        Check whether one item of the joined texts contains a keyword.
+        
+        Args:
+            blob: Joined texts and item offsets from _build_blob
+            position: Position of the item
+            keyword_lower: Lowercased search keyword
+            
+        Returns:
+            bool: True if the keyword occurs within the item's text
+        """
+        text, offsets = blob
+        end = offsets[position + 1] - 1 if position + 1 < len(offsets) else len(text)
+        return text.find(keyword_lower, offsets[position], end) != -1
+    
+    @staticmethod
+    def _prefix_postings(index: Dict[str, Set[int]], vocab: List[str], prefix: str) -> Set[int]:
+        """
+        Collect the positions of every indexed token that starts with a prefix.
+        
+        Args:
+            index: Inverted index mapping token to item positions
+            vocab: Sorted tokens of the index
+            prefix: Lowercased token prefix
+            
+        Returns:
+            Set[int]: Positions of the items holding a token with that prefix
+        """
+        postings: Set[int] = set()
+        for i in range(bisect_left(vocab, prefix), len(vocab)):
+            if not vocab[i].startswith(prefix):
+                break
+            postings |= index[vocab[i]]
+        return postings
+    
+    def _search_index(
+        self,
+        index: Dict[str, Set[int]],
+        vocab: List[str],
+        blob: Tuple[str, List[int]],
+        keyword_lower: str
+    ) -> List[int]:
+        """
+        Find the items containing a keyword, narrowing them with the inverted index.
+        
+        A keyword word with a non-word character on both sides must be a whole word of
+        the text and is looked up directly; one with a non-word character only before it
+        must start a word, found by bisecting the sorted tokens. A word that can sit in
+        the middle of a text word constrains nothing, so keywords made only of such words
+        (a single word, say) are found by scanning the joined texts instead. Candidates
+        are confirmed against the same joined texts, so results equal a scan of every item.
+        
+        Args:
+            index: Inverted index mapping token to item positions
+            vocab: Sorted tokens of the index
+            blob: Joined texts of the items the index refers to
+            keyword_lower: Lowercased search keyword
+            
+        Returns:
+            List[int]: Positions of the matching items, in their original order
+        """
+        candidates: Optional[Set[int]] = None
+        for match in _TOKEN_RE.finditer(keyword_lower):
+            if match.start() == 0:
+                continue
+            token = match.group()
+            if match.end() < len(keyword_lower):
+                postings = index.get(token, set())
+            else:
+                postings = self._prefix_postings(index, vocab, token)
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return []
+        
+        if candidates is None:
+            return self._scan_blob(blob, keyword_lower)
+        
+        return [
+            position
+            for position in sorted(candidates)
+            if self._blob_contains(blob, position, keyword_lower)
         ]
+    
+    @staticmethod
+    def _decision_record(decisions: Dict[str, List[str]], position: int) -> Dict:
+        """
+        Build the dictionary view of one decision.
         
-        for pattern in action_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                action_text = match.group(1).strip()
-                if action_text:
-                    self.action_items.append({
-                        'id': self._generate_id(action_text),
-                        'text': action_text,
-                        'type': 'action_item',
-                        'status': 'pending',
-                        'timestamp': datetime.now().isoformat()
-                    })
-    
-    def _extract_responsible_parties(self, content: str) -> None:
+        Args:
+            decisions: Decision columns
+            position: Position of the decision
+            
+        Returns:
+            Dict: Decision with id, text, type and timestamp
+        """
+        return {
+            'id': decisions['id'][position],
+            'text': decisions['text'][position],
+            'type': 'decision',
+            'timestamp': decisions['timestamp'][position]
+        }
+    
+    @staticmethod
+    def _action_record(action_items: Dict[str, List[str]], position: int) -> Dict:
+        """
+        Build the dictionary view of one action item.
+        
+        Args:
+            action_items: Action item columns
+            position: Position of the action item
+            
+        Returns:
+            Dict: Action item with id, text, type, status and timestamp
+        """
+        return {
+            'id': action_items['id'][position],
+            'text': action_items['text'][position],
+            'type': 'action_item',
+            'status': action_items['status'][position],
+            'timestamp': action_items['timestamp'][position]
+        }
+    
+    def _extract_responsible_parties(self, content: Union[bytes, mmap.mmap]) -> None:
         """
         Extract responsible parties mentioned in the minutes.
         
         Args:
-            content: Minutes text
+            content: Raw minutes bytes
         """
-        responsible_patterns = [
-            r"RESPONSIBLE:\s*([A-Za-z\s]+)(?=\n|ACTION:|DECISION:|$)",
-            r"ASSIGNED TO:\s*([A-Za-z\s]+)(?=\n|ACTION:|DECISION:|$)",
-            r"@([A-Za-z\s]+)",
-            r"([A-Z][a-z]+\s+[A-Z][a-z]+)\s+(?:will|shall|must|should)"
-        ]
+        parties: Dict[str, Set[str]] = {
+            name: set(ids) for name, ids in self.responsible_parties.items()
+        }
+        for match in _RESPONSIBLE_RE.finditer(content):
+            name = next(group for group in match.groups() if group is not None).decode('ascii').strip()
+            if len(name) > 2 and name not in parties:
+                parties[name] = set()
         
-        for pattern in responsible_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                name = match.group(1).strip()
-                if len(name) > 2 and name not in self.responsible_parties:
-                    self.responsible_parties[name] = []
-                    
-        for decision in self.decisions:
-            for name in self.responsible_parties.keys():
-                if name.lower() in decision['text'].lower():
-                    self.responsible_parties[name].append(decision['id'])
-                    
-        for action in self.action_items:
-            for name in self.responsible_parties.keys():
-                if name.lower() in action['text'].lower():
-                    self.responsible_parties[name].append(action['id'])
+        self.responsible_parties = parties
+        self._build_name_automaton()
+        if self._name_automaton is not None:
+            items = itertools.chain(
+                zip(self.decisions['id'], self.decisions['text_lower']),
+                zip(self.action_items['id'], self.action_items['text_lower'])
+            )
+            for item_id, text_lower in items:
+                for _, (_, originals) in self._name_automaton.iter(text_lower):
+                    for name in originals:
+                        parties[name].add(item_id)
+        
+        self.responsible_parties = {name: sorted(ids) for name, ids in parties.items()}
+    
+    def _build_name_automaton(self) -> None:
+        """
+        Build an Aho-Corasick automaton over the lowercased responsible party names.
+        """
+        self._names_lower = {name: name.lower() for name in self.responsible_parties.keys()}
+        names = {}
+        for name, name_lower in self._names_lower.items():
+            names.setdefault(name_lower, []).append(name)
+        
+        if not names:
+            self._name_automaton = None
+            return
+        
+        automaton = ahocorasick.Automaton()
+        for name_lower, originals in names.items():
+            automaton.add_word(name_lower, (len(name_lower), originals))
+        automaton.make_automaton()
+        self._name_automaton = automaton
     
     def _generate_id(self, text: str) -> str:
         """
@@ -147,7 +418,7 @@ class BoardMinutesProcessor:
         Returns:
             str: Unique ID
         """
-        return hashlib.md5(text.encode()).hexdigest()[:8]
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=4).hexdigest()
     
     def query_decisions(self, keyword: str) -> List[Dict]:
         """
@@ -159,11 +430,10 @@ class BoardMinutesProcessor:
         Returns:
             List[Dict]: List of found decisions
         """
-        results = []
-        for decision in self.decisions:
-            if keyword.lower() in decision['text'].lower():
-                results.append(decision)
-        return results
+        positions = self._search_index(
+            self._decision_index, self._decision_vocab, self._decision_blob, keyword.lower()
+        )
+        return [self._decision_record(self.decisions, position) for position in positions]
     
     def query_action_items(self, status: Optional[str] = None, responsible: Optional[str] = None) -> List[Dict]:
         """
@@ -176,14 +446,16 @@ class BoardMinutesProcessor:
         Returns:
             List[Dict]: List of found action items
         """
-        results = []
-        for item in self.action_items:
-            if status and item.get('status') != status:
-                continue
-            if responsible and responsible.lower() not in item['text'].lower():
-                continue
-            results.append(item)
-        return results
+        if responsible:
+            positions = self._search_index(
+                self._action_index, self._action_vocab, self._action_blob, responsible.lower()
+            )
+        else:
+            positions = range(len(self.action_items['id']))
+        if status:
+            statuses = self.action_items['status']
+            positions = [position for position in positions if statuses[position] == status]
+        return [self._action_record(self.action_items, position) for position in positions]
     
     def get_responsible_parties(self, name: Optional[str] = None) -> Dict[str, List[str]]:
         """
@@ -197,8 +469,8 @@ class BoardMinutesProcessor:
         """
         if name:
             name_lower = name.lower()
-            for key in self.responsible_parties.keys():
-                if name_lower in key.lower():
+            for key, key_lower in self._names_lower.items():
+                if name_lower in key_lower:
                     return {key: self.responsible_parties[key]}
             return {}
         return self.responsible_parties
@@ -213,22 +485,45 @@ class BoardMinutesProcessor:
         Returns:
             str: Anonymized query
         """
-        for name in self.responsible_parties.keys():
-            query = query.replace(name, "[PERSON]")
+        if self._name_automaton is not None:
+            query = self._redact_names(query)
         
-        sensitive_patterns = [
-            r'\b\d{9}\b',
-            r'\b\d{11}\b',
-            r'\b\d{14}\b',
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            r'\$\s*\d+(?:,\d{3})*(?:\.\d{2})?\b',
-            r'\b(?:confidential|classified|restricted|private)\b'
-        ]
+        if _SENSITIVE_MARKER_RE.search(query) is None:
+            query_lower = query.lower()
+            if not any(word in query_lower for word in _SENSITIVE_WORDS):
+                return query
+        return _SENSITIVE_RE.sub("[REDACTED]", query)
+    
+    def _redact_names(self, query: str) -> str:
+        """
+        Replace every responsible party name in the query with a placeholder.
         
-        for pattern in sensitive_patterns:
-            query = re.sub(pattern, "[REDACTED]", query, flags=re.IGNORECASE)
+        Args:
+            query: Original query
             
-        return query
+        Returns:
+            str: Query with names replaced by [PERSON]
+        """
+        # str.lower already has an ASCII fast path and keeps the length of ASCII text
+        query_lower = query.lower() if query.isascii() else query.translate(_ASCII_LOWER)
+        spans = sorted(
+            (end - length + 1, end + 1)
+            for end, (length, _) in self._name_automaton.iter(query_lower)
+        )
+        if not spans:
+            return query
+        
+        parts = []
+        position = 0
+        for start, end in spans:
+            if end <= position:
+                continue
+            if start >= position:
+                parts.append(query[position:start])
+                parts.append("[PERSON]")
+            position = end
+        parts.append(query[position:])
+        return "".join(parts)
     
     def verify_fact_online(self, fact: str) -> Dict[str, Union[str, bool, float]]:
         """
@@ -240,33 +535,43 @@ class BoardMinutesProcessor:
         Returns:
             Dict: Verification result
         """
-        try:
-            anonymized_fact = self._anonymize_query(fact)
+        anonymized_fact = self._anonymize_query(fact)
+        
+        cached = self._verification_cache.get(anonymized_fact)
+        if cached is not None:
+            self._verification_cache.move_to_end(anonymized_fact)
+            return dict(cached)
+        
+        result = self._verify_anonymized(anonymized_fact)
+        # Only answers from the search engine are cached; errors are retried on the next call
+        if result['source'] == 'duckduckgo_search':
+            self._verification_cache[anonymized_fact] = result
+            if len(self._verification_cache) > _VERIFICATION_CACHE_SIZE:
+                self._verification_cache.popitem(last=False)
+        return dict(result)
+    
+    def _verify_anonymized(self, anonymized_fact: str) -> Dict[str, Union[str, bool, float]]:
+        """
+        Search for an already anonymized fact and score the results.
+        
+        Args:
+            anonymized_fact: Fact with sensitive information removed
             
-            search_url = "https://html.duckduckgo.com/html/"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
+        Returns:
+            Dict: Verification result
+        """
+        try:
             params = {
                 'q': anonymized_fact,
                 'kl': 'us-en'
             }
             
-            response = requests.get(search_url, headers=headers, params=params, timeout=10)
+            with self._session.get(_SEARCH_URL, params=params, timeout=10, stream=True) as response:
+                status_code = response.status_code
+                if status_code == 200:
+                    results_found = self._count_results(response)
             
-            if response.status_code == 200:
-                content = response.text
-                
-                result_patterns = [
-                    r'<a[^>]*class="result__a"[^>]*>.*?</a>',
-                    r'<h2[^>]*class="result__title"[^>]*>.*?</h2>'
-                ]
-                
-                results_found = 0
-                for pattern in result_patterns:
-                    matches = re.findall(pattern, content, re.IGNORECASE | re.DOTALL)
-                    results_found += len(matches)
-                
+            if status_code == 200:
                 if results_found > 0:
                     return {
                         'verified': True,
@@ -288,7 +593,7 @@ class BoardMinutesProcessor:
                     'verified': False,
                     'confidence': 0.0,
                     'source': 'api_error',
-                    'message': f'Search API error: {response.status_code}',
+                    'message': f'Search API error: {status_code}',
                     'results_count': 0
                 }
                 
@@ -301,6 +606,33 @@ class BoardMinutesProcessor:
                 'results_count': 0
             }
     
+    @staticmethod
+    def _count_results(response: requests.Response) -> int:
+        """
+        Count search results while the page downloads, stopping once confidence saturates.
+        
+        Args:
+            response: Streaming search response
+            
+        Returns:
+            int: Number of result links and titles found
+        """
+        response.encoding = response.encoding or 'utf-8'
+        results_found = 0
+        pending = ""
+        for chunk in response.iter_content(chunk_size=8192, decode_unicode=True):
+            pending += chunk
+            # A tag may still be incomplete after the last '<', so it waits for the next chunk
+            cut = pending.rfind('<')
+            if cut == -1:
+                complete, pending = pending, ""
+            else:
+                complete, pending = pending[:cut], pending[cut:]
+            results_found += len(_RESULT_LINK_RE.findall(complete)) + len(_RESULT_TITLE_RE.findall(complete))
+            if results_found >= _SATURATING_RESULTS:
+                return results_found
+        return results_found + len(_RESULT_LINK_RE.findall(pending)) + len(_RESULT_TITLE_RE.findall(pending))
+    
     def search_minutes(self, query: str, verify_online: bool = False) -> Dict:
         """
         Comprehensive search in minutes with optional online verification.
@@ -319,8 +651,9 @@ class BoardMinutesProcessor:
             'verification': None
         }
         
-        for name in self.responsible_parties.keys():
-            if query.lower() in name.lower():
+        query_lower = query.lower()
+        for name, name_lower in self._names_lower.items():
+            if query_lower in name_lower:
                 results['responsible_parties'][name] = self.responsible_parties[name]
         
         if verify_online and results['decisions']:
@@ -337,11 +670,11 @@ class BoardMinutesProcessor:
             Dict: Minutes summary
         """
         return {
-            'total_decisions': len(self.decisions),
-            'total_action_items': len(self.action_items),
+            'total_decisions': len(self.decisions['id']),
+            'total_action_items': len(self.action_items['id']),
             'total_responsible_parties': len(self.responsible_parties),
-            'decisions_summary': [d['text'][:100] + '...' for d in self.decisions[:5]],
-            'pending_actions': len([a for a in self.action_items if a.get('status') == 'pending']),
+            'decisions_summary': [text[:100] + '...' for text in self.decisions['text'][:5]],
+            'pending_actions': self.action_items['status'].count('pending'),
             'processed_at': datetime.now().isoformat()
         }
     
@@ -358,13 +691,16 @@ class BoardMinutesProcessor:
         try:
             export_data = {
                 'summary': self.generate_summary(),
-                'decisions': self.decisions,
-                'action_items': self.action_items,
+                'decisions': [
+                    self._decision_record(self.decisions, position)
+                    for position in range(len(self.decisions['id']))
+                ],
+                'action_items': self.query_action_items(),
                 'responsible_parties': self.responsible_parties
             }
             
-            with open(file_path, 'w', encoding='utf-8') as file:
-                json.dump(export_data, file, indent=2, ensure_ascii=False)
+            with open(file_path, 'wb') as file:
+                file.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             return True
         except Exception as e:
             print(f"Export error: {e}")
@@ -383,13 +719,15 @@ def print_results(results: list, item_type: str) -> None:
         print(f"No {item_type} found.")
         return
     
-    print(f"\nFound {len(results)} {item_type}:")
+    lines = [f"\nFound {len(results)} {item_type}:"]
     for i, item in enumerate(results, 1):
-        print(f"\n{i}. ID: {item['id']}")
-        print(f"   Text: {item['text']}")
+        lines.append(f"\n{i}. ID: {item['id']}")
+        lines.append(f"   Text: {item['text']}")
         if 'status' in item:
-            print(f"   Status: {item['status']}")
-        print(f"   Timestamp: {item['timestamp']}")
+            lines.append(f"   Status: {item['status']}")
+        lines.append(f"   Timestamp: {item['timestamp']}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
 
 
 def print_responsible_parties(parties: Dict[str, List[str]]) -> None:
@@ -550,8 +888,7 @@ def main():
                     print_results(results['decisions'], "decisions")
                 
                 # Print action items (filter by query)
-                relevant_actions = [action for action in results['action_items'] 
-                                  if args.lower() in action['text'].lower()]
+                relevant_actions = assistant.query_action_items(responsible=args)
                 if relevant_actions:
                     print_results(relevant_actions, "action items")
                 
@@ -1,12 +1,172 @@
-import difflib
-import hashlib
-import json
+import asyncio
+import mmap
 import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Union
 
-import requests
+import aiohttp
+import hyperscan
+import numpy as np
+import orjson
+import xxhash
+from datasketch import MinHash, MinHashLSH
+from diskcache import Cache
+from rapidfuzz import fuzz, process
+
+# Each family of fact patterns is one alternation, scanned in a single pass per document.
+# Numerical alternatives have one named group, the value, so match.lastgroup identifies it.
+# Changes ("grew by 30%") overlap amounts ("30%") and keep their own pass so both are found
+_NUMBER_RES = (
+    re.compile(
+        r'(?P<amount>\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:percent|%|dollars?|\$|million|billion|thousand)'
+        r'|in\s+(?P<year>\d{4})\s*[,.]'  # Years
+        r'|(?P<count>\d+(?:,\d{3})*)\s+(?:people|users|customers|employees)',
+        re.IGNORECASE
+    ),
+    re.compile(
+        r'(?:increased|decreased|grew|fell)\s+by\s+(?P<change>\d+(?:\.\d+)?)\s*(?:percent|%)',
+        re.IGNORECASE
+    )
+)
+
+_ENTITY_RE = re.compile(
+    r'(?P<entity_is>[A-Z][a-z]+\s+[A-Z][a-z]+)\s+(?:is|was|will be|became)\s+(?P<claim_is>[^.]+)'
+    r'|(?P<entity_said>[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:announced|reported|stated|confirmed)\s+(?P<claim_said>[^.]+)'
+    r'|The\s+(?P<entity_the>[^,]+),\s+(?P<claim_the>[^,]+),\s+(?P<rest_the>[^.]+)',
+    re.IGNORECASE
+)
+# Last group closed by each entity alternative -> (entity group, claim group)
+_ENTITY_GROUPS = {
+    'claim_is': ('entity_is', 'claim_is'),
+    'claim_said': ('entity_said', 'claim_said'),
+    'rest_the': ('entity_the', 'claim_the')
+}
+
+# Hyperscan reports which extraction passes match anywhere in a document in one SIMD
+# scan, so the re passes (still needed for the capture groups) only run where they hit
+_EXTRACTION_RES = (*_NUMBER_RES, _ENTITY_RE)
+_PREFILTER_FLAGS = (
+    hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+    | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+)
+_PREFILTER_DB = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+_PREFILTER_DB.compile(
+    expressions=[pattern.pattern.encode() for pattern in _EXTRACTION_RES],
+    ids=list(range(len(_EXTRACTION_RES))),
+    flags=[_PREFILTER_FLAGS] * len(_EXTRACTION_RES)
+)
+
+# One alternation redacts every sensitive pattern in a single scan of the query
+_SENSITIVE_RE = re.compile(
+    "|".join(
+        f"(?:{pattern})"
+        for pattern in (
+            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b',  # Names
+            r'\b\d{9,}\b',  # Long numbers
+            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Emails
+            r'\$\s*\d+(?:,\d{3})*(?:\.\d{2})?\b',  # Specific amounts
+            r'\b(?:confidential|internal|proprietary|classified)\b'  # Sensitive keywords
+        )
+    ),
+    re.IGNORECASE
+)
+
+# The gap between the two halves of a contradiction is bounded to 200 characters, so each
+# candidate start scans a fixed window instead of backtracking over the rest of the line
+_INCONSISTENCY_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'(\d+)\s*percent.{0,200}?(\d+)\s*percent',  # Multiple percentages
+        r'(increased|grew).{0,200}?(decreased|fell)',  # Contradictory trends
+        r'(always|never).{0,200}?(sometimes|often)',  # Absolute vs relative
+        r'(all|every).{0,200}?(some|few)',  # Universal vs particular
+    )
+)
+
+# Search results are counted by their class attributes; no regex runs over the HTML
+_RESULT_MARKERS = ('class="result__a"', 'class="result__title"', 'class="result__snippet"')
+
+_SEARCH_URL = "https://html.duckduckgo.com/html/"
+_SEARCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+_SEARCH_TIMEOUT = 15
+_SEARCH_CONNECTIONS = 32
+
+# Verification results persist across runs; stale web evidence expires after a week
+_CACHE_DIR = '.fact_cache'
+_CACHE_TTL = 7 * 24 * 3600
+
+_LOAD_WORKERS = 32
+
+# Anonymized queries and their keywords are memoized; retried statements skip both steps
+_QUERY_CACHE_SIZE = 4096
+
+_WORD_RE = re.compile(r'\S+')
+_KEYWORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'was', 'are', 'were', 'will', 'would', 'could', 'should'
+})
+
+# MinHash LSH used to find candidate pairs before the exact similarity check
+_LSH_THRESHOLD = 0.2
+_LSH_NUM_PERM = 64
+
+
+@dataclass(slots=True)
+class Fact:
+    """
+    A factual statement extracted from a document.
+    """
+    id: str
+    type: str
+    statement: str
+    context: str
+    confidence: float
+    value: Optional[str] = None
+    value_num: Optional[float] = None
+    entity: Optional[str] = None
+    claim: Optional[str] = None
+    source_document: str = ""
+    source_path: str = ""
+    # Lowercased copies, made once for all later comparisons
+    statement_l: str = field(init=False)
+    context_l: str = field(init=False)
+    entity_l: Optional[str] = field(init=False)
+    claim_l: Optional[str] = field(init=False)
+    
+    def __post_init__(self):
+        self.statement_l = self.statement.lower()
+        self.context_l = self.context.lower()
+        self.entity_l = self.entity.lower() if self.entity is not None else None
+        self.claim_l = self.claim.lower() if self.claim is not None else None
+    
+    def to_dict(self) -> Dict:
+        """
+        Convert the fact to the plain dict returned in results.
+        
+        Returns:
+            Dict: Fact fields, leaving out unset optional fields and lowercased copies
+        """
+        fact = {
+            'id': self.id,
+            'type': self.type,
+            'statement': self.statement,
+            'context': self.context,
+            'confidence': self.confidence
+        }
+        for name in ('value', 'value_num', 'entity', 'claim'):
+            value = getattr(self, name)
+            if value is not None:
+                fact[name] = value
+        fact['source_document'] = self.source_document
+        fact['source_path'] = self.source_path
+        return fact
 
 
 class FactualChecker:
@@ -15,11 +175,21 @@ class FactualChecker:
     and online sources to prevent hallucinations and ensure accuracy.
     """
     
-    def __init__(self):
+    def __init__(self, cache_dir: str = _CACHE_DIR):
         self.documents: Dict[str, Dict] = {}
-        self.facts_database: List[Dict] = []
-        self.verification_cache: Dict[str, Dict] = {}
+        self.facts_database: List[Fact] = []
+        self.verification_cache: Cache = Cache(cache_dir)
+        # Cache keys this checker looked up or stored, in first-use order; the persistent
+        # cache also holds other runs' entries, which do not belong in this checker's export
+        self._session_cache_keys: Dict[str, None] = {}
         self.consistency_threshold: float = 0.7
+        # Lowercased fact statements for document checks, rebuilt after new loads
+        self._statements_lower: Optional[List[str]] = None
+        # Numeric columns parallel to facts_database (NaN marks a missing value), grown
+        # by doubling; the consistency checks read these instead of the fact objects
+        self._fact_count = 0
+        self._fact_values = np.empty(0, dtype=np.float64)
+        self._fact_confidence = np.empty(0, dtype=np.float64)
         
     def load_document(self, file_path: str, document_type: str = "text") -> bool:
         """
@@ -32,27 +202,69 @@ class FactualChecker:
         Returns:
             bool: True if loaded successfully
         """
+        loaded = self._read_document(file_path, document_type)
+        if loaded is None:
+            return False
+        
+        self._store_document(*loaded)
+        return True
+    
+    def _read_document(self, file_path: str, document_type: str = "text") -> Optional[Tuple[str, Dict]]:
+        """
+        Read a document and extract its facts without touching shared state,
+        so several documents can be read concurrently.
+        
+        Args:
+            file_path: Path to the document
+            document_type: Type of document (text, json, etc.)
+            
+        Returns:
+            Optional[Tuple[str, Dict]]: Document ID and document, or None on error
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
+            with open(file_path, 'rb') as file:
+                # The content is decoded straight from the mapped pages, with no intermediate
+                # bytes copy, and the prefilter scans them; no token list is built for the count
+                try:
+                    raw = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    raw = b""
+                try:
+                    content = str(raw, 'utf-8')
+                    if '\r' in content:
+                        # Same newlines as a text-mode read
+                        content = content.replace('\r\n', '\n').replace('\r', '\n')
+                    facts = self._extract_facts(content, raw)
+                    word_count = sum(1 for _ in _WORD_RE.finditer(content))
+                finally:
+                    if isinstance(raw, mmap.mmap):
+                        raw.close()
                 
             document_id = self._generate_document_id(file_path)
             
-            self.documents[document_id] = {
+            return document_id, {
                 'path': file_path,
                 'type': document_type,
                 'content': content,
-                'facts': self._extract_facts(content),
+                'facts': facts,
                 'loaded_at': datetime.now().isoformat(),
-                'word_count': len(content.split())
+                'word_count': word_count
             }
             
-            self._update_facts_database(document_id)
-            return True
-            
         except Exception as e:
             print(f"Error loading document: {e}")
-            return False
+            return None
+    
+    def _store_document(self, document_id: str, document: Dict) -> None:
+        """
+        Register a read document and its facts.
+        
+        Args:
+            document_id: ID of the document
+            document: Document read by _read_document
+        """
+        self.documents[document_id] = document
+        self._update_facts_database(document_id)
     
     def load_multiple_documents(self, file_paths: List[str]) -> Dict[str, bool]:
         """
@@ -64,9 +276,19 @@ class FactualChecker:
         Returns:
             Dict: Results of loading each document
         """
+        if not file_paths:
+            return {}
+        
+        # Documents are read in a thread pool; they are stored afterwards on this
+        # thread, in input order, so the facts database matches a sequential load
+        with ThreadPoolExecutor(max_workers=min(_LOAD_WORKERS, len(file_paths))) as executor:
+            loaded_documents = list(executor.map(self._read_document, file_paths))
+        
         results = {}
-        for file_path in file_paths:
-            results[file_path] = self.load_document(file_path)
+        for file_path, loaded in zip(file_paths, loaded_documents):
+            if loaded is not None:
+                self._store_document(*loaded)
+            results[file_path] = loaded is not None
         return results
     
     def _generate_document_id(self, file_path: str) -> str:
@@ -79,61 +301,59 @@ class FactualChecker:
         Returns:
             str: Unique document ID
         """
-        return hashlib.md5(file_path.encode()).hexdigest()[:8]
+        return xxhash.xxh3_64_hexdigest(file_path.encode())[:8]
     
-    def _extract_facts(self, content: str) -> List[Dict]:
+    def _extract_facts(self, content: str, raw: Optional[Union[bytes, mmap.mmap]] = None) -> List[Fact]:
         """
         Extract factual statements from document content.
         
         Args:
             content: Document content
+            raw: UTF-8 encoded content, if already available
             
         Returns:
-            List[Dict]: Extracted facts
+            List[Fact]: Extracted facts
         """
         facts = []
+        hits = set()
+        _PREFILTER_DB.scan(
+            content.encode() if raw is None else raw,
+            match_event_handler=lambda pattern_id, start, end, flags, context: hits.add(pattern_id)
+        )
         
         # Extract numerical facts
-        number_patterns = [
-            r'(\d+(?:,\d{3})*(?:\.\d+)?)\s*(?:percent|%|dollars?|\$|million|billion|thousand)',
-            r'in\s+(\d{4})\s*[,.]',  # Years
-            r'(\d+(?:,\d{3})*)\s+(?:people|users|customers|employees)',
-            r'(?:increased|decreased|grew|fell)\s+by\s+(\d+(?:\.\d+)?)\s*(?:percent|%)'
-        ]
-        
-        for pattern in number_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                fact = {
-                    'id': hashlib.md5(match.group(0).encode()).hexdigest()[:8],
-                    'type': 'numerical',
-                    'statement': match.group(0).strip(),
-                    'value': match.group(1),
-                    'context': self._get_context(content, match.start(), match.end()),
-                    'confidence': 0.8
-                }
-                facts.append(fact)
+        for pattern_id, pattern in enumerate(_NUMBER_RES):
+            if pattern_id not in hits:
+                continue
+            for match in pattern.finditer(content):
+                value = match.group(match.lastgroup)
+                try:
+                    value_num = float(value.replace(',', ''))
+                except ValueError:
+                    value_num = None
+                facts.append(Fact(
+                    id=xxhash.xxh3_64_hexdigest(match.group(0).encode())[:8],
+                    type='numerical',
+                    statement=match.group(0).strip(),
+                    value=value,
+                    value_num=value_num,
+                    context=self._get_context(content, match.start(), match.end()),
+                    confidence=0.8
+                ))
         
         # Extract named entities and statements
-        entity_patterns = [
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+(?:is|was|will be|became)\s+([^.]+)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:announced|reported|stated|confirmed)\s+([^.]+)',
-            r'The\s+([^,]+),\s+([^,]+),\s+([^.]+)'
-        ]
-        
-        for pattern in entity_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                fact = {
-                    'id': hashlib.md5(match.group(0).encode()).hexdigest()[:8],
-                    'type': 'statement',
-                    'statement': match.group(0).strip(),
-                    'entity': match.group(1).strip(),
-                    'claim': match.group(2).strip() if len(match.groups()) > 1 else "",
-                    'context': self._get_context(content, match.start(), match.end()),
-                    'confidence': 0.6
-                }
-                facts.append(fact)
+        if len(_NUMBER_RES) in hits:
+            for match in _ENTITY_RE.finditer(content):
+                entity_group, claim_group = _ENTITY_GROUPS[match.lastgroup]
+                facts.append(Fact(
+                    id=xxhash.xxh3_64_hexdigest(match.group(0).encode())[:8],
+                    type='statement',
+                    statement=match.group(0).strip(),
+                    entity=match.group(entity_group).strip(),
+                    claim=match.group(claim_group).strip(),
+                    context=self._get_context(content, match.start(), match.end()),
+                    confidence=0.6
+                ))
         
         return facts
     
@@ -162,10 +382,38 @@ class FactualChecker:
             document_id: ID of the document
         """
         document = self.documents[document_id]
+        self._statements_lower = None
         for fact in document['facts']:
-            fact['source_document'] = document_id
-            fact['source_path'] = document['path']
+            fact.source_document = document_id
+            fact.source_path = document['path']
             self.facts_database.append(fact)
+        self._append_fact_columns(document['facts'])
+        
+        # Kept with the document so reports don't walk every fact again
+        document['fact_confidence_sum'] = sum(fact.confidence for fact in document['facts'])
+    
+    def _append_fact_columns(self, facts: List[Fact]) -> None:
+        """
+        Append facts to the numeric columns, doubling their capacity when full.
+        
+        Args:
+            facts: Facts just appended to facts_database
+        """
+        start = self._fact_count
+        end = start + len(facts)
+        if end > self._fact_values.size:
+            capacity = max(end, 2 * self._fact_values.size)
+            values = np.empty(capacity, dtype=np.float64)
+            confidence = np.empty(capacity, dtype=np.float64)
+            values[:start] = self._fact_values[:start]
+            confidence[:start] = self._fact_confidence[:start]
+            self._fact_values, self._fact_confidence = values, confidence
+        
+        self._fact_values[start:end] = [
+            fact.value_num if fact.value_num is not None else np.nan for fact in facts
+        ]
+        self._fact_confidence[start:end] = [fact.confidence for fact in facts]
+        self._fact_count = end
     
     def check_consistency_across_documents(self) -> Dict[str, List[Dict]]:
         """
@@ -184,18 +432,20 @@ class FactualChecker:
         # Group facts by similarity
         fact_groups = self._group_similar_facts()
         
-        for group in fact_groups:
+        for positions in fact_groups:
+            # Results carry plain dicts, so callers can index and json.dump them
+            group = [self.facts_database[position].to_dict() for position in positions]
             if len(group) == 1:
                 consistency_results['unique_facts'].append(group[0])
-            elif self._are_facts_consistent(group):
+            elif self._are_facts_consistent(positions):
                 consistency_results['consistent_facts'].append({
                     'facts': group,
-                    'agreement_level': self._calculate_agreement_level(group)
+                    'agreement_level': self._calculate_agreement_level(positions)
                 })
             else:
                 consistency_results['inconsistent_facts'].append({
                     'facts': group,
-                    'conflicts': self._identify_conflicts(group)
+                    'conflicts': self._identify_conflicts(positions)
                 })
         
         # Calculate overall confidence
@@ -205,36 +455,107 @@ class FactualChecker:
         
         return consistency_results
     
-    def _group_similar_facts(self) -> List[List[Dict]]:
+    def _group_similar_facts(self) -> List[List[int]]:
         """
         Group similar facts for comparison.
         
         Returns:
-            List[List[Dict]]: Groups of similar facts
+            List[List[int]]: Groups of similar facts, as positions in facts_database
         """
         groups = []
-        processed_facts = set()
+        candidates = self._find_similarity_candidates()
+        
+        # Fact IDs are interned to small integers once, so a bytearray with one byte per
+        # distinct ID marks processed facts (facts repeating a statement share an ID)
+        id_codes: Dict[str, int] = {}
+        fact_codes = [id_codes.setdefault(fact.id, len(id_codes)) for fact in self.facts_database]
+        processed_facts = bytearray(len(id_codes))
         
         for i, fact1 in enumerate(self.facts_database):
-            if fact1['id'] in processed_facts:
+            if processed_facts[fact_codes[i]]:
                 continue
                 
-            group = [fact1]
-            processed_facts.add(fact1['id'])
+            group = [i]
+            processed_facts[fact_codes[i]] = 1
             
-            for j, fact2 in enumerate(self.facts_database[i+1:], i+1):
-                if fact2['id'] in processed_facts:
+            # Only facts that share an LSH bucket (or an entity) can pass the exact check
+            for j in sorted(candidates[i]):
+                if j <= i:
+                    continue
+                if processed_facts[fact_codes[j]]:
                     continue
                     
+                fact2 = self.facts_database[j]
                 if self._are_facts_similar(fact1, fact2):
-                    group.append(fact2)
-                    processed_facts.add(fact2['id'])
+                    group.append(j)
+                    processed_facts[fact_codes[j]] = 1
             
             groups.append(group)
         
         return groups
     
-    def _are_facts_similar(self, fact1: Dict, fact2: Dict) -> bool:
+    def _find_similarity_candidates(self) -> List[Set[int]]:
+        """
+        Find, for each fact, the other facts that may be similar to it.
+        
+        Numerical facts are bucketed by MinHash LSH over their context and statements
+        by MinHash LSH over their claim, each type in its own index. Statements with
+        the same entity are always candidates, since a shared entity makes them similar.
+        
+        Returns:
+            List[Set[int]]: Candidate positions in facts_database for each fact
+        """
+        indexes = {
+            'numerical': MinHashLSH(threshold=_LSH_THRESHOLD, num_perm=_LSH_NUM_PERM),
+            'statement': MinHashLSH(threshold=_LSH_THRESHOLD, num_perm=_LSH_NUM_PERM)
+        }
+        signatures = []
+        entities: Dict[str, List[int]] = {}
+        
+        for position, fact in enumerate(self.facts_database):
+            index = indexes.get(fact.type)
+            if index is None:
+                signatures.append(None)
+                continue
+            
+            text = fact.context_l if fact.type == 'numerical' else fact.claim_l
+            signature = self._minhash(text)
+            index.insert(position, signature)
+            signatures.append(signature)
+            
+            if fact.type == 'statement':
+                entities.setdefault(fact.entity_l, []).append(position)
+        
+        candidates = []
+        for position, fact in enumerate(self.facts_database):
+            if signatures[position] is None:
+                candidates.append(set())
+                continue
+            found = set(indexes[fact.type].query(signatures[position]))
+            if fact.type == 'statement':
+                found.update(entities[fact.entity_l])
+            candidates.append(found)
+        
+        return candidates
+    
+    @staticmethod
+    def _minhash(text: str) -> MinHash:
+        """
+        Build the MinHash signature of a text's character 3-shingles.
+        
+        Args:
+            text: Lowercased text
+            
+        Returns:
+            MinHash: Signature of the text
+        """
+        signature = MinHash(num_perm=_LSH_NUM_PERM)
+        signature.update_batch(
+            text[i:i + 3].encode('utf-8') for i in range(max(1, len(text) - 2))
+        )
+        return signature
+    
+    def _are_facts_similar(self, fact1: Fact, fact2: Fact) -> bool:
         """
         Check if two facts are similar enough to compare.
         
@@ -246,112 +567,115 @@ class FactualChecker:
             bool: True if facts are similar
         """
         # Compare by type first
-        if fact1['type'] != fact2['type']:
+        if fact1.type != fact2.type:
             return False
         
         # For numerical facts, compare context
-        if fact1['type'] == 'numerical':
-            similarity = difflib.SequenceMatcher(
-                None, 
-                fact1['context'].lower(), 
-                fact2['context'].lower()
-            ).ratio()
-            return similarity > 0.6
+        if fact1.type == 'numerical':
+            similarity = fuzz.ratio(
+                fact1.context_l,
+                fact2.context_l,
+                score_cutoff=60
+            )
+            return similarity > 60
         
         # For statements, compare entity and claim
-        if fact1['type'] == 'statement':
-            entity_match = fact1.get('entity', '').lower() == fact2.get('entity', '').lower()
-            claim_similarity = difflib.SequenceMatcher(
-                None,
-                fact1.get('claim', '').lower(),
-                fact2.get('claim', '').lower()
-            ).ratio()
-            return entity_match or claim_similarity > 0.7
+        if fact1.type == 'statement':
+            entity_match = fact1.entity_l == fact2.entity_l
+            if entity_match:
+                return True
+            claim_similarity = fuzz.ratio(
+                fact1.claim_l,
+                fact2.claim_l,
+                score_cutoff=70
+            )
+            return claim_similarity > 70
         
         return False
     
-    def _are_facts_consistent(self, facts: List[Dict]) -> bool:
+    def _are_facts_consistent(self, positions: List[int]) -> bool:
         """
         Check if a group of facts is consistent.
         
         Args:
-            facts: List of facts to check
+            positions: Positions in facts_database of the facts to check
             
         Returns:
             bool: True if facts are consistent
         """
-        if len(facts) < 2:
+        if len(positions) < 2:
             return True
         
+        fact_type = self.facts_database[positions[0]].type
+        
         # For numerical facts, check if values are close
-        if facts[0]['type'] == 'numerical':
-            values = []
-            for fact in facts:
-                try:
-                    value = float(fact['value'].replace(',', ''))
-                    values.append(value)
-                except ValueError:
-                    continue
+        if fact_type == 'numerical':
+            values = self._numeric_values(positions)
             
-            if len(values) < 2:
+            if values.size < 2:
                 return True
             
-            max_val = max(values)
-            min_val = min(values)
+            max_val = values.max()
             
             # Allow 10% variance
-            return (max_val - min_val) / max_val <= 0.1 if max_val > 0 else True
+            return bool(np.ptp(values) / max_val <= 0.1) if max_val > 0 else True
         
         # For statements, check claim consistency
-        if facts[0]['type'] == 'statement':
-            claims = [fact.get('claim', '').lower() for fact in facts]
-            unique_claims = set(claims)
+        if fact_type == 'statement':
+            unique_claims = {self.facts_database[position].claim_l for position in positions}
             return len(unique_claims) <= 2  # Allow some variation in wording
         
         return True
     
-    def _calculate_agreement_level(self, facts: List[Dict]) -> float:
+    def _numeric_values(self, positions: List[int]) -> np.ndarray:
+        """
+        Gather the parsed values of numerical facts from the value column.
+        
+        Args:
+            positions: Positions in facts_database of numerical facts
+            
+        Returns:
+            np.ndarray: Values of the facts that have a parsed value
+        """
+        values = self._fact_values[positions]
+        return values[~np.isnan(values)]
+    
+    def _calculate_agreement_level(self, positions: List[int]) -> float:
         """
         Calculate agreement level among similar facts.
         
         Args:
-            facts: List of facts
+            positions: Positions in facts_database of the facts
             
         Returns:
             float: Agreement level (0.0 to 1.0)
         """
-        if len(facts) < 2:
+        if len(positions) < 2:
             return 1.0
         
-        total_confidence = sum(fact['confidence'] for fact in facts)
-        return min(1.0, total_confidence / len(facts))
+        return min(1.0, float(self._fact_confidence[positions].mean()))
     
-    def _identify_conflicts(self, facts: List[Dict]) -> List[str]:
+    def _identify_conflicts(self, positions: List[int]) -> List[str]:
         """
         Identify specific conflicts in a group of facts.
         
         Args:
-            facts: List of conflicting facts
+            positions: Positions in facts_database of the conflicting facts
             
         Returns:
             List[str]: List of identified conflicts
         """
         conflicts = []
+        facts = [self.facts_database[position] for position in positions]
         
-        if facts[0]['type'] == 'numerical':
-            values = []
-            for fact in facts:
-                try:
-                    value = float(fact['value'].replace(',', ''))
-                    values.append((value, fact['source_path']))
-                except ValueError:
-                    continue
+        if facts[0].type == 'numerical':
+            values = self._numeric_values(positions)
             
-            if len(values) > 1:
-                conflicts.append(f"Numerical conflict: values range from {min(v[0] for v in values)} to {max(v[0] for v in values)}")
+            if values.size > 1:
+                conflicts.append(f"Numerical conflict: values range from {values.min()} to {values.max()}")
         
-        elif facts[0]['type'] == 'statement':
-            claims = [(fact.get('claim', ''), fact['source_path']) for fact in facts]
+        elif facts[0].type == 'statement':
+            claims = [(fact.claim, fact.source_path) for fact in facts]
             unique_claims = list(set(claim[0] for claim in claims))
             if len(unique_claims) > 1:
                 conflicts.append(f"Statement conflict: {len(unique_claims)} different claims found")
@@ -366,76 +690,117 @@ class FactualChecker:
             fact: Fact to verify
             context: Additional context
             
+        Returns:
+            Dict: Verification result
+        """
+        return self.verify_facts_online([(fact, context)])[0]
+    
+    def verify_facts_online(self, facts: List[Tuple[str, str]]) -> List[Dict[str, Union[str, bool, float]]]:
+        """
+        Verify several facts online concurrently over one pooled session.
+        
+        Safe to call from code that already runs an event loop (a notebook, an async
+        caller): asyncio.run cannot nest there, so the requests run on a worker thread.
+        
+        Args:
+            facts: (fact, context) pairs to verify
+            
+        Returns:
+            List[Dict]: Verification results, in the same order as facts
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._verify_facts_async(facts))
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._verify_facts_async(facts)).result()
+    
+    async def _verify_facts_async(self, facts: List[Tuple[str, str]]) -> List[Dict[str, Union[str, bool, float]]]:
+        """
+        Fan out the searches for a batch of facts.
+        
+        Args:
+            facts: (fact, context) pairs to verify
+            
+        Returns:
+            List[Dict]: Verification results, in the same order as facts
+        """
+        connector = aiohttp.TCPConnector(limit=_SEARCH_CONNECTIONS, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=_SEARCH_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=_SEARCH_TIMEOUT)
+        ) as session:
+            return await asyncio.gather(*(
+                self._verify_one(session, fact, context) for fact, context in facts
+            ))
+    
+    async def _verify_one(self, session: aiohttp.ClientSession, fact: str, context: str) -> Dict[str, Union[str, bool, float]]:
+        """
+        Verify a single fact, using the cache before issuing any request.
+        
+        Args:
+            session: Shared HTTP session
+            fact: Fact to verify
+            context: Additional context
+            
         Returns:
             Dict: Verification result
         """
         # Check cache first
-        cache_key = hashlib.md5(f"{fact}{context}".encode()).hexdigest()
-        if cache_key in self.verification_cache:
-            return self.verification_cache[cache_key]
+        cache_key = xxhash.xxh3_128_hexdigest(f"{fact}{context}".encode())
+        self._session_cache_keys[cache_key] = None
+        cached = self.verification_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             # Anonymize the query
             anonymized_fact = self._anonymize_query(f"{fact} {context}".strip())
             
-            search_url = "https://html.duckduckgo.com/html/"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
             params = {
                 'q': anonymized_fact,
                 'kl': 'us-en'
             }
             
-            response = requests.get(search_url, headers=headers, params=params, timeout=15)
-            
-            if response.status_code == 200:
-                content = response.text
-                
-                # Count search results
-                result_patterns = [
-                    r'<a[^>]*class="result__a"[^>]*>.*?</a>',
-                    r'<h2[^>]*class="result__title"[^>]*>.*?</h2>',
-                    r'<div[^>]*class="result__snippet"[^>]*>.*?</div>'
-                ]
-                
-                results_found = 0
-                for pattern in result_patterns:
-                    matches = re.findall(pattern, content, re.IGNORECASE | re.DOTALL)
-                    results_found += len(matches)
-                
-                # Analyze content for verification keywords
-                verification_keywords = self._extract_verification_keywords(anonymized_fact)
-                keyword_matches = 0
-                
-                for keyword in verification_keywords:
-                    if keyword.lower() in content.lower():
-                        keyword_matches += 1
-                
-                confidence = min(0.9, (results_found * 0.1) + (keyword_matches * 0.2))
-                
-                result = {
-                    'verified': results_found > 0,
-                    'confidence': confidence,
-                    'source': 'duckduckgo_search',
-                    'message': f'Found {results_found} related sources, {keyword_matches} keyword matches',
-                    'results_count': results_found,
-                    'keyword_matches': keyword_matches
-                }
-                
-                # Cache the result
-                self.verification_cache[cache_key] = result
-                return result
-                
-            else:
-                result = {
-                    'verified': False,
-                    'confidence': 0.0,
-                    'source': 'api_error',
-                    'message': f'Search API error: {response.status_code}',
-                    'results_count': 0
-                }
-                return result
+            async with session.get(_SEARCH_URL, params=params) as response:
+                if response.status == 200:
+                    content = await response.text()
+                    
+                    # Count search results
+                    results_found = sum(content.count(marker) for marker in _RESULT_MARKERS)
+                    
+                    # Analyze content for verification keywords
+                    # Keywords are already lowercase, so the page is lowered once for all of them
+                    verification_keywords = self._extract_verification_keywords(anonymized_fact)
+                    content_lower = content.lower()
+                    keyword_matches = sum(keyword in content_lower for keyword in verification_keywords)
+                    
+                    confidence = min(0.9, (results_found * 0.1) + (keyword_matches * 0.2))
+                    
+                    result = {
+                        'verified': results_found > 0,
+                        'confidence': confidence,
+                        'source': 'duckduckgo_search',
+                        'message': f'Found {results_found} related sources, {keyword_matches} keyword matches',
+                        'results_count': results_found,
+                        'keyword_matches': keyword_matches
+                    }
+                    
+                    # Cache the result
+                    self.verification_cache.set(cache_key, result, expire=_CACHE_TTL)
+                    return result
+                    
+                else:
+                    result = {
+                        'verified': False,
+                        'confidence': 0.0,
+                        'source': 'api_error',
+                        'message': f'Search API error: {response.status}',
+                        'results_count': 0
+                    }
+                    return result
                 
         except Exception as e:
             result = {
@@ -447,7 +812,9 @@ class FactualChecker:
             }
             return result
     
-    def _anonymize_query(self, query: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=_QUERY_CACHE_SIZE)
+    def _anonymize_query(query: str) -> str:
         """
         Anonymize query by removing sensitive information.
         
@@ -458,21 +825,11 @@ class FactualChecker:
             str: Anonymized query
         """
         # Remove specific names and sensitive patterns
-        sensitive_patterns = [
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b',  # Names
-            r'\b\d{9,}\b',  # Long numbers
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Emails
-            r'\$\s*\d+(?:,\d{3})*(?:\.\d{2})?\b',  # Specific amounts
-            r'\b(?:confidential|internal|proprietary|classified)\b'  # Sensitive keywords
-        ]
-        
-        anonymized = query
-        for pattern in sensitive_patterns:
-            anonymized = re.sub(pattern, "[REDACTED]", anonymized, flags=re.IGNORECASE)
-        
-        return anonymized.strip()
+        return _SENSITIVE_RE.sub("[REDACTED]", query).strip()
     
-    def _extract_verification_keywords(self, fact: str) -> List[str]:
+    @staticmethod
+    @lru_cache(maxsize=_QUERY_CACHE_SIZE)
+    def _extract_verification_keywords(fact: str) -> Tuple[str, ...]:
         """
         Extract keywords from fact for verification.
         
@@ -480,15 +837,13 @@ class FactualChecker:
             fact: Fact to extract keywords from
             
         Returns:
-            List[str]: List of keywords
+            Tuple[str, ...]: Keywords, as a tuple since results are shared through the cache
         """
         # Remove common words and extract meaningful terms
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'was', 'are', 'were', 'will', 'would', 'could', 'should'}
-        
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', fact.lower())
-        keywords = [word for word in words if word not in stop_words]
+        words = _KEYWORD_RE.findall(fact.lower())
+        keywords = [word for word in words if word not in _STOP_WORDS]
         
-        return keywords[:5]  # Return top 5 keywords
+        return tuple(keywords[:5])  # Return top 5 keywords
     
     def comprehensive_fact_check(self, statement: str) -> Dict:
         """
@@ -559,19 +914,26 @@ class FactualChecker:
                 'supporting_facts': []
             }
         
-        supporting_facts = []
-        statement_lower = statement.lower()
-        
-        for fact in self.facts_database:
-            fact_text = fact['statement'].lower()
-            similarity = difflib.SequenceMatcher(None, statement_lower, fact_text).ratio()
-            
-            if similarity > 0.6:
-                supporting_facts.append({
-                    'fact': fact,
-                    'similarity': similarity,
-                    'source': fact['source_path']
-                })
+        # One vectorized scoring call against every statement, spread over all cores
+        scores = process.cdist(
+            [statement.lower()],
+            self._lowered_statements(),
+            scorer=fuzz.ratio,
+            score_cutoff=60,
+            dtype=np.float64,
+            workers=-1
+        )[0]
+        matches = np.flatnonzero(scores > 60)
+        
+        # Best supported facts first
+        supporting_facts = [
+            {
+                'fact': self.facts_database[index].to_dict(),
+                'similarity': float(scores[index]) / 100,
+                'source': self.facts_database[index].source_path
+            }
+            for index in matches[np.argsort(-scores[matches], kind='stable')]
+        ]
         
         if supporting_facts:
             avg_confidence = sum(sf['similarity'] * sf['fact']['confidence'] for sf in supporting_facts) / len(supporting_facts)
@@ -589,6 +951,17 @@ class FactualChecker:
                 'supporting_facts': []
             }
     
+    def _lowered_statements(self) -> List[str]:
+        """
+        Get the lowercased statements of all facts, in facts_database order.
+        
+        Returns:
+            List[str]: Lowercased fact statements
+        """
+        if self._statements_lower is None:
+            self._statements_lower = [fact.statement_l for fact in self.facts_database]
+        return self._statements_lower
+    
     def _check_internal_consistency(self, statement: str) -> Dict:
         """
         Check statement for internal consistency.
@@ -600,17 +973,9 @@ class FactualChecker:
             Dict: Consistency check results
         """
         # Basic consistency checks
-        inconsistency_patterns = [
-            r'(\d+)\s*percent.*?(\d+)\s*percent',  # Multiple percentages
-            r'(increased|grew).*?(decreased|fell)',  # Contradictory trends
-            r'(always|never).*?(sometimes|often)',  # Absolute vs relative
-            r'(all|every).*?(some|few)',  # Universal vs particular
-        ]
-        
         inconsistencies = []
-        for pattern in inconsistency_patterns:
-            matches = re.finditer(pattern, statement, re.IGNORECASE)
-            for match in matches:
+        for pattern in _INCONSISTENCY_PATTERNS:
+            for match in pattern.finditer(statement):
                 inconsistencies.append(f"Potential contradiction: {match.group(0)}")
         
         confidence = 1.0 - (len(inconsistencies) * 0.3)
@@ -657,7 +1022,7 @@ class FactualChecker:
                 'facts_count': len(document['facts']),
                 'word_count': document['word_count'],
                 'fact_density': len(document['facts']) / document['word_count'] if document['word_count'] > 0 else 0,
-                'avg_fact_confidence': sum(f['confidence'] for f in document['facts']) / len(document['facts']) if document['facts'] else 0
+                'avg_fact_confidence': document['fact_confidence_sum'] / len(document['facts']) if document['facts'] else 0
             }
         
         # Generate recommendations
@@ -684,10 +1049,15 @@ class FactualChecker:
         """
         try:
             report = self.generate_fact_report()
-            report['verification_cache'] = self.verification_cache
+            report['verification_cache'] = {}
+            for key in self._session_cache_keys:
+                # An entry can expire, or never have been stored after an error
+                result = self.verification_cache.get(key)
+                if result is not None:
+                    report['verification_cache'][key] = result
             
-            with open(file_path, 'w', encoding='utf-8') as file:
-                json.dump(report, file, indent=2, ensure_ascii=False)
+            with open(file_path, 'wb') as file:
+                file.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
             return True
         except Exception as e:
             print(f"Export error: {e}")
@@ -1,18 +1,95 @@
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 import argparse
+import ast
+import asyncio
 import os
 import re
 import json
-import glob
+from collections import namedtuple
+from contextlib import nullcontext
 import datetime
+import hashlib
+import httpx
+from functools import lru_cache
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("api_key"))
+# Transient failures (429, 5xx, timeouts, dropped connections) are retried by the SDK
+# with exponential backoff that honours Retry-After; invalid JSON is retried below
+API_RETRIES = 3
+VALIDATION_RETRIES = 2
+
+# One keep-alive pool per client, multiplexed over HTTP/2, so concurrent requests reuse
+# connections instead of paying a TCP and TLS handshake each
+HTTP_CONNECTIONS = 100
+HTTP_TIMEOUT = 30.0
+HTTP_LIMITS = httpx.Limits(max_connections=HTTP_CONNECTIONS, max_keepalive_connections=HTTP_CONNECTIONS)
+
+client = OpenAI(
+    api_key=os.getenv("api_key"),
+    max_retries=API_RETRIES,
+    http_client=httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+)
+async_client = AsyncOpenAI(
+    api_key=os.getenv("api_key"),
+    max_retries=API_RETRIES,
+    http_client=httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+)
+
+# Defaults for the verification model; --model and --max-tokens override them
+MODEL = "gpt-4o-mini"
+# Bump whenever the verification prompt changes so cached responses are invalidated
+PROMPT_VERSION = 4
+# A status line and 2-3 sentences fit well under this; a lower cap also lowers latency
+MAX_TOKENS = 150
+
+# Every finished batch result is appended here, so a crashed run can be resumed
+RESULTS_FILE = "results.jsonl"
+
+# Patterns compiled once instead of on every call
+_LECTURE_RE = re.compile(r'(lecture_\d+)', re.IGNORECASE)
+# Also match the keys of JSON cut off before it could be parsed
+_STATUS_RE = re.compile(r'"?Status"?\s*:\s*"?(PASS|FAIL)', re.IGNORECASE)
+_EVAL_RE = re.compile(r'"?Evaluation"?\s*:\s*"?(.*)', re.IGNORECASE | re.DOTALL)
+_DOCSTRING_RE = re.compile(r'"""(.*?)"""', re.DOTALL)
+
+# Parsed once at import and shared by every task; a missing or invalid file means no descriptions
+try:
+    with open("task_descriptions.json", "r", encoding="utf-8") as _file:
+        _TASK_DESCRIPTIONS = json.load(_file)
+except (OSError, ValueError):
+    _TASK_DESCRIPTIONS = {}
+
+# Prompt size caps, in characters: scripts are compacted, inputs and outputs keep head and tail
+SCRIPT_CHAR_LIMIT = 4000
+CONTENT_HEAD_CHARS = 2000
+CONTENT_TAIL_CHARS = 2000
+# Responses are constrained to this schema, so they need no free-text parsing
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "task_verification",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "status": {"type": "string", "enum": ["PASS", "FAIL"]},
+                "evaluation": {"type": "string"}
+            },
+            "required": ["status", "evaluation"],
+            "additionalProperties": False
+        }
+    }
+}
+
+@lru_cache(maxsize=512)
+def _read_file_cached(file_path, mtime_ns, size):
+    """Read a file once per (path, mtime, size); a changed file gets a new cache entry"""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return file.read()
 
 def read_file(file_path):
     """Read content from a file"""
@@ -20,45 +97,251 @@ def read_file(file_path):
         return ""  
         
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
+        stat = os.stat(file_path)
+        return _read_file_cached(file_path, stat.st_mtime_ns, stat.st_size)
     except Exception as e:
         print(f"Error reading file {file_path}: {e}")
         return None
 
-def verify_task_output(task_description, input_content, output_content, script_content):
-    """Use OpenAI to verify if the output correctly addresses the task"""
+def cache_key(*parts):
+    """Cache address for a verification: SHA-256 over the model settings and the length-prefixed parts
+    
+    Each model, prompt version and token cap gets its own entries, so runs with different
+    --model or --max-tokens values never overwrite each other's cache.
+    """
+    digest = hashlib.sha256()
+    for part in (MODEL, str(PROMPT_VERSION), str(MAX_TOKENS), *parts):
+        data = (part or "").encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+def cache_get(cache_dir, key):
+    """Return the cached verification for key, or None on a miss"""
+    cache_path = os.path.join(cache_dir, f"{key}.json")
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+        
+    return entry.get("response")
+
+def cache_set(cache_dir, key, response):
+    """Store a verification response under key"""
+    entry = {
+        "response": response,
+        "model": MODEL,
+        "prompt_version": PROMPT_VERSION,
+        "max_tokens": MAX_TOKENS,
+        "timestamp": datetime.datetime.now().isoformat()
+    }
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_path = os.path.join(cache_dir, f"{key}.json")
+        # Written aside and renamed so concurrent readers never see a partial entry
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(entry, file)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Error writing cache entry {key}: {e}")
+
+def head_tail(text, head=CONTENT_HEAD_CHARS, tail=CONTENT_TAIL_CHARS):
+    """Keep the start and end of a long text, marking how much was cut from the middle"""
+    if not text or len(text) <= head + tail:
+        return text
+    return f"{text[:head]}\n... [{len(text) - head - tail} characters omitted] ...\n{text[-tail:]}"
+
+def compact_script(source, limit=SCRIPT_CHAR_LIMIT):
+    """Strip docstrings, comments and blank lines from a script and cap its length
+    
+    The model is told to ignore implementation details, so these only cost input tokens.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return head_tail(source, limit // 2, limit // 2)
+    
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and node.body:
+            first = node.body[0]
+            if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) and isinstance(first.value.value, str):
+                node.body = node.body[1:] or [ast.Pass()]
+    
+    # ast.unparse emits no comments or blank lines
+    return head_tail(ast.unparse(tree), limit // 2, limit // 2)
+
+def build_messages(task_description, input_content, output_content, script_content):
+    """Build the chat messages asking the model to verify one task"""
+    input_content = head_tail(input_content)
+    output_content = head_tail(output_content)
+    script_content = compact_script(script_content)
+    
     if not input_content:
         input_content_text = "No input file provided."
     else:
         input_content_text = f"Input content:\n{input_content}\n\n"
     
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system", 
-                "content": "You are an evaluation assistant that verifies if the OUTPUT correctly addresses the given task. Your evaluation must follow this exact format:\n\n1) Status: [PASS/FAIL]\n\n2) Evaluation: [2-3 sentences explaining if the OUTPUT meets the TASK requirements]\n\nIMPORTANT RULES:\n- Assign PASS if the output meets the requirements of the task, otherwise assign FAIL.\n- Assume all scripts have executed successfully - the OUTPUT exists because the script worked correctly.\n- Focus ONLY on comparing the OUTPUT with the TASK requirements.\n- Do NOT speculate about how the code might execute - it DID execute successfully.\n- Ignore implementation details completely (API keys, error handling, etc.).\n- Judge solely on whether the OUTPUT matches what was requested in the TASK."
-            },
-            {
-                "role": "user", 
-                "content": f"Task description: {task_description}\n\n"
-                           f"{input_content_text}"
-                           f"Output content:\n{output_content}\n\n"
-                           f"Script content:\n{script_content}\n\n"
-                           f"IMPORTANT INSTRUCTIONS:\n"
-                           f"1. The script has been SUCCESSFULLY EXECUTED, and the output above is the actual result.\n"
-                           f"2. Follow the EXACT format for your evaluation:\n"
-                           f"   a) Status: [PASS/FAIL]\n"
-                           f"   b) Evaluation: [Your brief assessment in 2-3 sentences]\n"
-                           f"3. ONLY evaluate if the OUTPUT correctly fulfills the TASK description.\n"
-                           f"4. DO NOT consider implementation details of the script."
-            }
-        ],
-        max_tokens=500
-    )
+    return [
+        {
+            "role": "system", 
+            "content": "You are an evaluation assistant that verifies if the OUTPUT correctly addresses the given task. Respond with a JSON object with these fields:\n\n- status: PASS or FAIL\n- evaluation: 2-3 sentences explaining if the OUTPUT meets the TASK requirements\n\nIMPORTANT RULES:\n- Assign PASS if the output meets the requirements of the task, otherwise assign FAIL.\n- Assume all scripts have executed successfully - the OUTPUT exists because the script worked correctly.\n- Focus ONLY on comparing the OUTPUT with the TASK requirements.\n- Do NOT speculate about how the code might execute - it DID execute successfully.\n- Ignore implementation details completely (API keys, error handling, etc.).\n- Judge solely on whether the OUTPUT matches what was requested in the TASK.\n- Keep the evaluation to the 2-3 sentences; add nothing else."
+        },
+        {
+            "role": "user", 
+            "content": f"Task description: {task_description}\n\n"
+                       f"{input_content_text}"
+                       f"Output content:\n{output_content}\n\n"
+                       f"Script content:\n{script_content}\n\n"
+                       f"IMPORTANT INSTRUCTIONS:\n"
+                       f"1. The script has been SUCCESSFULLY EXECUTED, and the output above is the actual result.\n"
+                       f"2. Set status to PASS or FAIL and give your brief assessment in 2-3 sentences as evaluation.\n"
+                       f"3. ONLY evaluate if the OUTPUT correctly fulfills the TASK description.\n"
+                       f"4. DO NOT consider implementation details of the script."
+        }
+    ]
+
+def validation_error(verification_result):
+    """Describe why a response does not match the verification schema, or None if it does"""
+    try:
+        verification = json.loads(verification_result or "")
+    except ValueError as e:
+        return f"invalid JSON ({e})"
+    
+    if not isinstance(verification, dict):
+        return "expected a JSON object"
+    if verification.get("status") not in ("PASS", "FAIL"):
+        return 'status must be "PASS" or "FAIL"'
+    if not isinstance(verification.get("evaluation"), str) or not verification["evaluation"].strip():
+        return "evaluation must be a non-empty string"
+    return None
+
+def retry_messages(messages, verification_result, error):
+    """Extend a conversation so the model can fix an invalid response"""
+    return messages + [
+        {"role": "assistant", "content": verification_result or ""},
+        {"role": "user", "content": f"Your output had error: {error}. Fix and retry."}
+    ]
+
+def _cheap_precheck(task_description, input_content, output_content, script_content):
+    """Return a FAIL verification for cases that need no model, or None to ask the model"""
+    task = (task_description or "").lower()
+    
+    if not (script_content or "").strip():
+        evaluation = "The script is empty, so it cannot fulfil the task."
+    elif not (output_content or "").strip() and "optional" not in task:
+        evaluation = "No output was produced: the output file is missing or empty."
+    elif (input_content or "").strip() and output_content == input_content and "transform" in task:
+        evaluation = "The output is identical to the input, so nothing was transformed."
+    else:
+        return None
     
-    return response.choices[0].message.content
+    return json.dumps({"status": "FAIL", "evaluation": evaluation})
+
+def verify_task_output(task_description, input_content, output_content, script_content, cache_dir=None):
+    """Use OpenAI to verify if the output correctly addresses the task
+    
+    Trivial failures are answered without the model, and with cache_dir set,
+    byte-identical jobs are answered from the on-disk cache.
+    """
+    precheck = _cheap_precheck(task_description, input_content, output_content, script_content)
+    if precheck is not None:
+        return precheck
+    
+    if cache_dir:
+        key = cache_key(task_description, input_content, output_content, script_content)
+        cached = cache_get(cache_dir, key)
+        if cached is not None:
+            return cached
+    
+    messages = build_messages(task_description, input_content, output_content, script_content)
+    max_tokens = MAX_TOKENS
+    for _ in range(VALIDATION_RETRIES + 1):
+        response = client.chat.completions.create(
+            model=MODEL,
+            messages=messages,
+            max_tokens=max_tokens,
+            response_format=RESPONSE_FORMAT
+        )
+        
+        choice = response.choices[0]
+        verification = choice.message.content
+        error = validation_error(verification)
+        if error is None:
+            break
+        if choice.finish_reason == "length":
+            # Cut off at the cap: the same prompt with room to finish, not feedback, fixes it
+            max_tokens *= 2
+        else:
+            messages = retry_messages(messages, verification, error)
+    
+    if cache_dir and error is None:
+        cache_set(cache_dir, key, verification)
+    
+    return verification
+
+async def verify_task_output_async(task_description, input_content, output_content, script_content, cache_dir=None):
+    """Async version of verify_task_output, used by batch runs"""
+    precheck = _cheap_precheck(task_description, input_content, output_content, script_content)
+    if precheck is not None:
+        return precheck
+    
+    if cache_dir:
+        key = cache_key(task_description, input_content, output_content, script_content)
+        cached = await asyncio.to_thread(cache_get, cache_dir, key)
+        if cached is not None:
+            return cached
+    
+    messages = build_messages(task_description, input_content, output_content, script_content)
+    max_tokens = MAX_TOKENS
+    for _ in range(VALIDATION_RETRIES + 1):
+        response = await async_client.chat.completions.create(
+            model=MODEL,
+            messages=messages,
+            max_tokens=max_tokens,
+            response_format=RESPONSE_FORMAT
+        )
+        
+        choice = response.choices[0]
+        verification = choice.message.content
+        error = validation_error(verification)
+        if error is None:
+            break
+        if choice.finish_reason == "length":
+            # Cut off at the cap: the same prompt with room to finish, not feedback, fixes it
+            max_tokens *= 2
+        else:
+            messages = retry_messages(messages, verification, error)
+    
+    if cache_dir and error is None:
+        await asyncio.to_thread(cache_set, cache_dir, key, verification)
+    
+    return verification
+
+def parse_verification(verification_result):
+    """Split a verification response into (status, evaluation)
+    
+    Responses are JSON; JSON cut off at the token cap and plain "Status: ... Evaluation: ..."
+    text from older runs are still understood.
+    """
+    try:
+        verification = json.loads(verification_result)
+        return verification["status"].upper(), verification["evaluation"].strip()
+    except (ValueError, TypeError, KeyError, AttributeError):
+        pass
+    
+    status_match = _STATUS_RE.search(verification_result or "")
+    eval_match = _EVAL_RE.search(verification_result or "")
+    status = status_match.group(1).upper() if status_match else "UNKNOWN"
+    evaluation = eval_match.group(1).strip() if eval_match else ""
+    if (verification_result or "").lstrip().startswith("{"):
+        evaluation = evaluation.rstrip("}").rstrip().rstrip('"')
+    return status, evaluation
+
+def format_verification(status, evaluation):
+    """Render a parsed verification as the human-readable result file text"""
+    return f"Status: {status}\n\nEvaluation: {evaluation}\n"
 
 def save_result(result, file_path):
     """Save verification result to a file"""
@@ -72,6 +355,30 @@ def save_result(result, file_path):
         print(f"Error saving result to {file_path}: {e}")
         return False
 
+def append_result(log, result):
+    """Append one result as a JSON line and flush it so it survives a crash"""
+    if log is not None:
+        log.write(json.dumps(result, ensure_ascii=False) + "\n")
+        log.flush()
+
+def load_results(results_file):
+    """Read results from a JSONL log; a later line for a script replaces an earlier one"""
+    results = {}
+    try:
+        with open(results_file, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by a crash
+                results[result.get("script")] = result
+    except FileNotFoundError:
+        return []
+    
+    return list(results.values())
+
 def get_dynamic_result_path(script_path):
     """Dynamically generate result path based on script path
     
@@ -79,7 +386,7 @@ def get_dynamic_result_path(script_path):
     Example: If script_path is 'lecture_1/tasks/meetingProcessing.py'
              Result will be 'results/lecture_1/meetingProcessing_verification.txt'
     """
-    lecture_match = re.search(r'(lecture_\d+)', script_path, re.IGNORECASE)
+    lecture_match = _LECTURE_RE.search(script_path)
     lecture_name = lecture_match.group(1) if lecture_match else "unknown_lecture"
     
     script_name = os.path.basename(script_path)
@@ -91,25 +398,17 @@ def get_dynamic_result_path(script_path):
 
 def extract_task_description(script_path):
     """Try to extract task description from script comments or task_descriptions.json"""
-    try:
-        with open("task_descriptions.json", "r", encoding="utf-8") as file:
-            descriptions = json.load(file)
-            
-        lecture_match = re.search(r'(lecture_\d+)', script_path, re.IGNORECASE)
-        lecture_name = lecture_match.group(1).lower() if lecture_match else None
-        
-        script_name = os.path.basename(script_path)
-        
-        if lecture_name and lecture_name in descriptions and script_name in descriptions[lecture_name]:
-            return descriptions[lecture_name][script_name]
-    except:
-        pass
+    lecture_match = _LECTURE_RE.search(script_path)
+    if lecture_match:
+        description = _TASK_DESCRIPTIONS.get(lecture_match.group(1).lower(), {}).get(os.path.basename(script_path))
+        if description is not None:
+            return description
         
     content = read_file(script_path)
     if not content:
         return None
         
-    comment_match = re.search(r'"""(.*?)"""', content, re.DOTALL)
+    comment_match = _DOCSTRING_RE.search(content)
     if comment_match:
         comment = comment_match.group(1).strip()
         if len(comment) > 20:
@@ -117,6 +416,18 @@ def extract_task_description(script_path):
             
     return None
 
+DirItem = namedtuple("DirItem", ["name", "path", "is_dir"])
+
+@lru_cache(maxsize=256)
+def _list_dir_cached(dir_path):
+    """List a directory once with os.scandir, skipping hidden entries like glob does"""
+    try:
+        with os.scandir(dir_path) as entries:
+            return tuple(DirItem(entry.name, entry.path, entry.is_dir())
+                         for entry in entries if not entry.name.startswith("."))
+    except OSError:
+        return ()
+
 def find_corresponding_files(script_path):
     """Find input and output files that correspond to the script"""
     script_dir = os.path.dirname(script_path)
@@ -125,33 +436,27 @@ def find_corresponding_files(script_path):
     script_name = os.path.basename(script_path)
     script_name_no_ext = os.path.splitext(script_name)[0]
     
-    utils_dir = os.path.join(lecture_dir, "utils")
-    potential_inputs = glob.glob(os.path.join(utils_dir, "*"))
-    
-    outputs_dir = os.path.join(lecture_dir, "outputs")
-    potential_outputs = glob.glob(os.path.join(outputs_dir, "*"))
+    potential_inputs = _list_dir_cached(os.path.join(lecture_dir, "utils"))
+    potential_outputs = _list_dir_cached(os.path.join(lecture_dir, "outputs"))
     
     input_file = None
     output_file = None
+    key = script_name_no_ext.lower()
     
-    for file in potential_inputs:
-        file_name = os.path.basename(file)
-        if script_name_no_ext.lower() in file_name.lower():
-            input_file = file
+    for item in potential_inputs:
+        if key in item.name.lower():
+            input_file = item.path
             break
     
-    for file in potential_outputs:
-        file_name = os.path.basename(file)
-        if script_name_no_ext.lower() in file_name.lower():
-            output_file = file
+    for item in potential_outputs:
+        if key in item.name.lower():
+            output_file = item.path
             break
             
     return input_file, output_file
 
-def process_single_task(script_path, task_description=None, input_file=None, output_file=None, result_file=None):
-    """Process a single task script and return verification result"""
-    print(f"Processing: {script_path}")
-    
+def resolve_task(script_path, task_description=None, input_file=None, output_file=None):
+    """Resolve the description and input/output paths of a task script"""
     if not os.path.exists(script_path):
         return {"error": f"Script file not found: {script_path}"}
         
@@ -164,106 +469,227 @@ def process_single_task(script_path, task_description=None, input_file=None, out
         auto_input, auto_output = find_corresponding_files(script_path)
         input_file = input_file or auto_input
         output_file = output_file or auto_output
-        
-    script_content = read_file(script_path)
-    input_content = read_file(input_file) if input_file else ""
-    output_content = read_file(output_file) if output_file else ""
     
+    return {
+        "script": script_path,
+        "input": input_file,
+        "output": output_file,
+        "task_description": task_description
+    }
+
+def attach_contents(task, script_content, input_content, output_content):
+    """Add the file contents to a resolved task, or return an error if a read failed"""
     if not script_content:
-        return {"error": f"Could not read script: {script_path}"}
+        return {"error": f"Could not read script: {task['script']}"}
         
-    if output_file and not output_content:
-        return {"error": f"Could not read output file: {output_file}"}
+    if task["output"] and not output_content:
+        return {"error": f"Could not read output file: {task['output']}"}
     
-    verification_result = verify_task_output(task_description, input_content, output_content, script_content)
+    return {
+        **task,
+        "input_content": input_content,
+        "output_content": output_content,
+        "script_content": script_content
+    }
+
+def prepare_task(script_path, task_description=None, input_file=None, output_file=None):
+    """Resolve and read everything needed to verify a task script"""
+    task = resolve_task(script_path, task_description, input_file, output_file)
+    if "error" in task:
+        return task
     
+    return attach_contents(task, read_file(task["script"]), read_file(task["input"]), read_file(task["output"]))
+
+async def prepare_task_async(script_path):
+    """Resolve a task script and read its script, input and output files concurrently"""
+    task = await asyncio.to_thread(resolve_task, script_path)
+    if "error" in task:
+        return task
+    
+    contents = await asyncio.gather(*(
+        asyncio.to_thread(read_file, task[key]) for key in ("script", "input", "output")
+    ))
+    return attach_contents(task, *contents)
+
+def finalize_task(task, verification_result, result_file=None):
+    """Save the verification of a prepared task and build its result entry"""
     if not result_file:
-        result_file = get_dynamic_result_path(script_path)
+        result_file = get_dynamic_result_path(task["script"])
     
-    save_success = save_result(verification_result, result_file)
-    
-    status_match = re.search(r'Status:\s*(PASS|FAIL)', verification_result, re.IGNORECASE)
-    status = status_match.group(1).upper() if status_match else "UNKNOWN"
+    status, evaluation = parse_verification(verification_result)
+    verification_text = format_verification(status, evaluation)
+    save_success = save_result(verification_text, result_file)
+    lecture_match = _LECTURE_RE.search(task["script"])
     
     return {
-        "script": script_path,
-        "input": input_file,
-        "output": output_file,
+        "script": task["script"],
+        "task_name": os.path.splitext(os.path.basename(task["script"]))[0],
+        "lecture": lecture_match.group(1) if lecture_match else "unknown",
+        "input": task["input"],
+        "output": task["output"],
         "result": result_file,
         "status": status,
-        "verification": verification_result,
+        "evaluation": evaluation,
+        "verification": verification_text,
         "save_success": save_success
     }
 
+def process_single_task(script_path, task_description=None, input_file=None, output_file=None, result_file=None, cache_dir=None):
+    """Process a single task script and return verification result"""
+    print(f"Processing: {script_path}")
+    
+    task = prepare_task(script_path, task_description, input_file, output_file)
+    if "error" in task:
+        return task
+    
+    verification_result = verify_task_output(
+        task["task_description"], task["input_content"], task["output_content"], task["script_content"], cache_dir
+    )
+    
+    return finalize_task(task, verification_result, result_file)
+
 def find_all_task_scripts():
     """Find all Python script files in the tasks directories"""
-    lecture_dirs = glob.glob("lecture_*")
     script_paths = []
     
-    for lecture_dir in lecture_dirs:
-        tasks_dir = os.path.join(lecture_dir, "tasks")
-        if os.path.isdir(tasks_dir):
-            scripts = glob.glob(os.path.join(tasks_dir, "*.py"))
-            script_paths.extend(scripts)
+    for item in _list_dir_cached("."):
+        if item.is_dir and item.name.startswith("lecture_"):
+            script_paths.extend(find_lecture_scripts(item.name))
     
     return script_paths
 
+def find_lecture_scripts(lecture_dir):
+    """Find the Python task scripts of a single lecture"""
+    tasks_dir = os.path.join(lecture_dir, "tasks")
+    return [item.path for item in _list_dir_cached(tasks_dir)
+            if not item.is_dir and item.name.endswith(".py")]
+
 def generate_summary_report(results, output_file="verification_summary.md"):
     """Generate a summary report of all verification results"""
     current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    report = f"# Task Verification Summary Report\n\n"
-    report += f"Generated: {current_time}\n\n"
+    report = ["# Task Verification Summary Report\n\n", f"Generated: {current_time}\n\n"]
     
     lecture_results = {}
     for result in results:
-        if "error" in result:
-            continue
-            
-        lecture_match = re.search(r'(lecture_\d+)', result["script"], re.IGNORECASE)
-        lecture = lecture_match.group(1) if lecture_match else "unknown"
-        
-        if lecture not in lecture_results:
-            lecture_results[lecture] = []
-            
-        lecture_results[lecture].append(result)
+        if "error" not in result:
+            lecture_results.setdefault(result["lecture"], []).append(result)
     
-    for lecture, lecture_results in sorted(lecture_results.items()):
-        report += f"## {lecture.capitalize()}\n\n"
+    for lecture, rows in sorted(lecture_results.items()):
+        report.append(f"## {lecture.capitalize()}\n\n")
         
-        lecture_results.sort(key=lambda x: 0 if x.get("status", "") == "PASS" else 1)
+        rows.sort(key=lambda x: 0 if x.get("status", "") == "PASS" else 1)
         
-        report += "| Task | Status | Evaluation |\n"
-        report += "|------|--------|------------|\n"
+        report.append("| Task | Status | Evaluation |\n")
+        report.append("|------|--------|------------|\n")
         
-        for result in lecture_results:
-            script_name = os.path.basename(result["script"])
-            task_name = os.path.splitext(script_name)[0]
+        for result in rows:
+            task_name = result["task_name"]
             status = result.get("status", "UNKNOWN")
             
-            verification = result.get("verification", "")
-            eval_match = re.search(r'Evaluation:\s*(.*?)(?:\.|$)', verification, re.DOTALL)
-            short_eval = eval_match.group(1).strip() if eval_match else "N/A"
+            evaluation = result.get("evaluation")
+            if evaluation is None:
+                evaluation = parse_verification(result.get("verification", ""))[1]
+            short_eval = evaluation.split(".", 1)[0].strip() or "N/A"
             
             result_file = os.path.relpath(result["result"]) if result.get("result") else "#"
             status_emoji = "✅" if status == "PASS" else "❌"
-            report += f"| [{task_name}]({result_file}) | {status_emoji} {status} | {short_eval} |\n"
+            report.append(f"| [{task_name}]({result_file}) | {status_emoji} {status} | {short_eval} |\n")
         
-        report += "\n"
+        report.append("\n")
     
     errors = [r for r in results if "error" in r]
     if errors:
-        report += "## Errors\n\n"
+        report.append("## Errors\n\n")
         for error in errors:
-            report += f"- **{error.get('script', 'Unknown script')}**: {error.get('error')}\n"
+            report.append(f"- **{error.get('script', 'Unknown script')}**: {error.get('error')}\n")
     
-    with open(output_file, "w", encoding="utf-8") as file:
-        file.write(report)
+    Path(output_file).write_text("".join(report), encoding="utf-8")
         
     return output_file
 
-def batch_process_tasks(scripts=None, max_workers=5):
-    """Process multiple task scripts in parallel"""
+def print_task_status(script, result):
+    """Print a one-line progress note for a processed script"""
+    if "error" in result:
+        print(f"✗ Error: {os.path.basename(script)} - {result['error']}")
+    else:
+        status = result.get("status", "UNKNOWN")
+        status_emoji = "✅" if status == "PASS" else "❌"
+        print(f"{status_emoji} Verified: {os.path.basename(script)} - Status: {status}")
+
+async def process_single_task_async(script_path, cache_dir=None):
+    """Process a single task script without blocking the event loop"""
+    print(f"Processing: {script_path}")
+    
+    task = await prepare_task_async(script_path)
+    if "error" in task:
+        return task
+    
+    verification_result = await verify_task_output_async(
+        task["task_description"], task["input_content"], task["output_content"], task["script_content"], cache_dir
+    )
+    
+    return await asyncio.to_thread(finalize_task, task, verification_result)
+
+async def _process_tasks_async(scripts, max_concurrency, cache_dir, log=None):
+    """Verify scripts concurrently, with at most max_concurrency requests in flight"""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run(script):
+        async with semaphore:
+            try:
+                result = await process_single_task_async(script, cache_dir)
+            except Exception as e:
+                print(f"✗ Error processing {script}: {e}")
+                result = {"script": script, "error": str(e)}
+        print_task_status(script, result)
+        append_result(log, result)
+        return result
+    
+    # Only a window of tasks exists at a time, so memory stays flat however many scripts
+    # there are; the extra half keeps the next scripts queued while requests are in flight
+    window = max_concurrency * 2
+    pending_scripts = iter(scripts)
+    inflight = set()
+    results = []
+    
+    while True:
+        for script in pending_scripts:
+            inflight.add(asyncio.create_task(run(script)))
+            if len(inflight) >= window:
+                break
+        
+        if not inflight:
+            return results
+        
+        done, inflight = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+        results.extend(task.result() for task in done)
+
+def batch_process_tasks(scripts=None, max_workers=50, cache_dir=None, results_file=None):
+    """Process multiple task scripts in parallel
+    
+    Requests run on one event loop and share the async client's keep-alive pool;
+    max_workers bounds how many are in flight at once. Each result is appended to
+    results_file as soon as it finishes.
+    """
+    if not scripts:
+        scripts = find_all_task_scripts()
+        
+    if not scripts:
+        print("No task scripts found.")
+        return []
+    
+    print(f"Found {len(scripts)} task scripts to process.")
+    
+    with open(results_file, "a", encoding="utf-8") if results_file else nullcontext() as log:
+        return asyncio.run(_process_tasks_async(scripts, max_workers, cache_dir, log))
+
+def batch_process_tasks_batch_api(scripts=None, cache_dir=None, poll_interval=30, results_file=None):
+    """Process multiple task scripts as a single OpenAI Batch API job
+    
+    Cheaper than one request per script and not bound by per-request rate limits,
+    but results arrive only when the whole job completes (up to 24h).
+    """
     if not scripts:
         scripts = find_all_task_scripts()
         
@@ -272,26 +698,95 @@ def batch_process_tasks(scripts=None, max_workers=5):
         return []
     
     print(f"Found {len(scripts)} task scripts to process.")
+    with open(results_file, "a", encoding="utf-8") if results_file else nullcontext() as log:
+        return _run_batch_api(scripts, cache_dir, poll_interval, log)
+
+def _run_batch_api(scripts, cache_dir, poll_interval, log):
+    """Build, submit and collect one Batch API job, logging each result as it is known"""
     results = []
+    pending = {}
+    batch_lines = []
+    
+    def record(script, result):
+        results.append(result)
+        print_task_status(script, result)
+        append_result(log, result)
+    
+    for script in scripts:
+        task = prepare_task(script)
+        if "error" in task:
+            record(script, task)
+            continue
+        
+        parts = (task["task_description"], task["input_content"], task["output_content"], task["script_content"])
+        task["cache_key"] = cache_key(*parts)
+        cached = _cheap_precheck(*parts)
+        if cached is None and cache_dir:
+            cached = cache_get(cache_dir, task["cache_key"])
+        if cached is not None:
+            result = finalize_task(task, cached)
+            record(script, result)
+            continue
+        
+        pending[script] = task
+        batch_lines.append(json.dumps({
+            "custom_id": script,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": MODEL,
+                "messages": build_messages(*parts),
+                "max_tokens": MAX_TOKENS,
+                "response_format": RESPONSE_FORMAT
+            }
+        }))
+    
+    if not pending:
+        return results
+    
+    batch_file = client.files.create(
+        file=("verification_batch.jsonl", "\n".join(batch_lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"Submitted batch {batch.id} with {len(pending)} requests.")
+    
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+        print(f"Batch {batch.id}: {batch.status}")
+    
+    output_lines = []
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if file_id:
+            output_lines.extend(client.files.content(file_id).text.splitlines())
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_script = {executor.submit(process_single_task, script): script for script in scripts}
+    for line in output_lines:
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        task = pending.pop(entry.get("custom_id"), None)
+        if task is None:
+            continue
         
-        for future in as_completed(future_to_script):
-            script = future_to_script[future]
-            try:
-                result = future.result()
-                results.append(result)
-                
-                if "error" in result:
-                    print(f"✗ Error: {os.path.basename(script)} - {result['error']}")
-                else:
-                    status = result.get("status", "UNKNOWN")
-                    status_emoji = "✅" if status == "PASS" else "❌"
-                    print(f"{status_emoji} Verified: {os.path.basename(script)} - Status: {status}")
-            except Exception as e:
-                print(f"✗ Error processing {script}: {e}")
-                results.append({"script": script, "error": str(e)})
+        response = entry.get("response") or {}
+        if response.get("status_code") == 200:
+            verification_result = response["body"]["choices"][0]["message"]["content"]
+            if cache_dir:
+                cache_set(cache_dir, task["cache_key"], verification_result)
+            result = finalize_task(task, verification_result)
+        else:
+            error = entry.get("error") or response.get("body", {}).get("error")
+            result = {"script": task["script"], "error": f"Batch request failed: {error}"}
+        record(task["script"], result)
+    
+    for script in pending:
+        result = {"script": script, "error": f"No result in batch {batch.id} (status: {batch.status})"}
+        record(script, result)
     
     return results
 
@@ -305,8 +800,16 @@ if __name__ == "__main__":
     parser.add_argument("--batch", action="store_true", help="Process all task scripts in batch mode")
     parser.add_argument("--lecture", help="Process only tasks from the specified lecture (e.g., 'lecture_1')")
     parser.add_argument("--summary", action="store_true", help="Generate a summary report after processing")
+    parser.add_argument("--batch-api", action="store_true", help="In batch mode, submit all verifications as one OpenAI Batch API job (cheaper, results may take hours)")
+    parser.add_argument("--model", default=MODEL, help=f"OpenAI model used for verification (default: {MODEL})")
+    parser.add_argument("--max-tokens", type=int, default=MAX_TOKENS, help=f"Maximum tokens per verification response (default: {MAX_TOKENS})")
+    parser.add_argument("--cache-dir", help="Directory for cached verifications; unchanged tasks skip the API call (optional)")
+    parser.add_argument("--results-file", default=RESULTS_FILE, help=f"JSONL log that batch results are appended to as they finish (default: {RESULTS_FILE})")
+    parser.add_argument("--resume", action="store_true", help="In batch mode, skip scripts already verified in --results-file instead of starting a new log")
     
     args = parser.parse_args()
+    MODEL = args.model
+    MAX_TOKENS = args.max_tokens
     
     if args.batch:
         if args.lecture:
@@ -315,14 +818,26 @@ if __name__ == "__main__":
                 print(f"Lecture tasks directory not found: {lecture_tasks_dir}")
                 exit(1)
                 
-            scripts = glob.glob(os.path.join(lecture_tasks_dir, "*.py"))
+            scripts = find_lecture_scripts(args.lecture)
         else:
             scripts = find_all_task_scripts()
+        
+        if args.resume:
+            done = {result["script"] for result in load_results(args.results_file) if "error" not in result}
+            scripts = [script for script in scripts if script not in done]
+            print(f"Resuming: {len(done)} scripts already verified in {args.results_file}.")
+        else:
+            open(args.results_file, "w", encoding="utf-8").close()
             
-        results = batch_process_tasks(scripts)
+        if not scripts:
+            print("No task scripts left to process.")
+        elif args.batch_api:
+            batch_process_tasks_batch_api(scripts, cache_dir=args.cache_dir, results_file=args.results_file)
+        else:
+            batch_process_tasks(scripts, cache_dir=args.cache_dir, results_file=args.results_file)
         
         if args.summary or True:
-            report_path = generate_summary_report(results)
+            report_path = generate_summary_report(load_results(args.results_file))
             print(f"\nSummary report generated: {report_path}")
             
     else:
@@ -340,9 +855,9 @@ if __name__ == "__main__":
             print("Error: Could not read required files")
             exit(1)
         
-        verification_result = verify_task_output(args.task or "", input_content, output_content, script_content)
+        verification_result = verify_task_output(args.task or "", input_content, output_content, script_content, args.cache_dir)
         
         result_path = args.result if args.result else get_dynamic_result_path(args.script)
         
-        save_result(verification_result, result_path)
+        save_result(format_verification(*parse_verification(verification_result)), result_path)
         print(f"Verification result saved to: {result_path}")
\ No newline at end of file